@@ -1,14 +1,73 @@
 # app.py
 
 import requests
-import pandas as pd
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import numpy as np
+from requests.adapters import BaseAdapter, HTTPAdapter
+from collections import OrderedDict
+from operator import attrgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
 from enum import Enum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import bisect
+import concurrent.futures
+import csv
+import hashlib
+import heapq
+import importlib
+import ipaddress
+import itertools
+import json
+import io
+import math
+import mmap
+import multiprocessing
+import queue
+import random
+import secrets
+import socket
+import sqlite3
+import threading
 import time
 import sys
 import os
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+class _LazyModule:
+    """Module proxy that defers the import until an attribute is first used"""
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+# Only needed for Parquet wallet files and sharding; keep them off the startup path
+pd = _LazyModule("pandas")
+managers = _LazyModule("multiprocessing.managers")
+
 class Meta(Enum):
     AI = "AI/Tech"
     ANIMALS = "Animals"
@@ -24,241 +83,2656 @@ class ScanStrategy(Enum):
     MID_CAP = "3M_OR_LESS"
     DIP_HUNTING = "BUYING_DIPS"
 
+def _parse_number(value) -> float:
+    """Parse an API number the way the scanner always has (`float(x or 0)`), NaN if invalid"""
+    try:
+        return float(value or 0)
+    except (TypeError, ValueError):
+        return math.nan
+
+class Pair:
+    """Compact DEXScreener pair holding only the fields the scanner reads, numbers parsed once"""
+
+    TEXT_FIELDS = {
+        'pair_address': ('pairAddress',),
+        'chain_id': ('chainId',),
+        'dex_id': ('dexId',),
+        'url': ('url',),
+        'name': ('baseToken', 'name'),
+        'symbol': ('baseToken', 'symbol'),
+        'token_address': ('baseToken', 'address')
+    }
+    NUMERIC_FIELDS = {
+        'price_usd': ('priceUsd',),
+        'liquidity': ('liquidity', 'usd'),
+        'volume_24h': ('volume', 'h24'),
+        'volume_6h': ('volume', 'h6'),
+        'volume_1h': ('volume', 'h1'),
+        'volume_5m': ('volume', 'm5'),
+        'fdv': ('fdv',),
+        'market_cap': ('marketCap',),
+        'price_change_5m': ('priceChange', 'm5'),
+        'price_change_1h': ('priceChange', 'h1'),
+        'price_change_6h': ('priceChange', 'h6'),
+        'price_change_24h': ('priceChange', 'h24'),
+        'pair_created_at': ('pairCreatedAt',)
+    }
+    RECORD_FIELDS = tuple(TEXT_FIELDS) + tuple(NUMERIC_FIELDS)
+    __slots__ = RECORD_FIELDS + ('wallet_analysis',)
+
+    def __init__(self, **fields):
+        for name in self.TEXT_FIELDS:
+            setattr(self, name, fields.get(name, ''))
+        for name in self.NUMERIC_FIELDS:
+            setattr(self, name, float(fields.get(name, 0.0)))
+        self.wallet_analysis = fields.get('wallet_analysis')
+
+    @classmethod
+    def from_raw(cls, raw: Dict) -> "Pair":
+        """Build from an API pair dict; the dict can be dropped afterwards"""
+        pair = cls.__new__(cls)
+        for name, (key, *sub) in cls.TEXT_FIELDS.items():
+            value = raw.get(key)
+            if sub:
+                value = value.get(sub[0]) if isinstance(value, dict) else None
+            setattr(pair, name, value if isinstance(value, str) else '')
+        for name, (key, *sub) in cls.NUMERIC_FIELDS.items():
+            if sub:
+                # Same as pair.get(key, {}).get(sub, 0): a non-dict parent is invalid
+                nested = raw.get(key, {})
+                value = _parse_number(nested.get(sub[0], 0)) if isinstance(nested, dict) else math.nan
+            else:
+                value = _parse_number(raw.get(key, 0))
+            setattr(pair, name, value)
+        pair.wallet_analysis = None
+        return pair
+
+    def to_record(self) -> list:
+        """Field values in RECORD_FIELDS order (for caches and snapshots)"""
+        return [getattr(self, name) for name in self.RECORD_FIELDS]
+
+    @classmethod
+    def from_record(cls, values: list) -> "Pair":
+        pair = cls.__new__(cls)
+        for name, value in zip(cls.RECORD_FIELDS, values):
+            setattr(pair, name, value)
+        pair.wallet_analysis = None
+        return pair
+
+    def __repr__(self) -> str:
+        return f"Pair({self.symbol or '?'} {self.pair_address})"
+
+def parse_pairs(source, chain_id: Optional[str] = 'solana') -> List[Pair]:
+    """Parse a DEXScreener response body (bytes or a binary stream) into Pair records
+
+    With ijson installed the body is streamed one pair at a time, so the full
+    nested response tree is never materialised.
+    """
+    if ijson is not None:
+        stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+        items = ijson.items(stream, 'pairs.item', use_float=True)
+    else:
+        data = source if isinstance(source, (bytes, bytearray)) else source.read()
+        items = (_json_loads(data) or {}).get('pairs') or []
+    return [
+        Pair.from_raw(raw) for raw in items
+        if chain_id is None or raw.get('chainId') == chain_id
+    ]
+
+def _encode_pairs(pairs: List[Pair]) -> str:
+    return json.dumps([pair.to_record() for pair in pairs], separators=(",", ":"))
+
+def _decode_pairs(body: str) -> List[Pair]:
+    return [Pair.from_record(values) for values in json.loads(body)]
+
+def _pack_strings(values: List[str]) -> np.ndarray:
+    """NUL-terminated UTF-8 strings as one byte array for binary snapshots"""
+    return np.frombuffer("".join(value + "\0" for value in values).encode(), dtype=np.uint8)
+
+def _unpack_strings(data: np.ndarray) -> List[str]:
+    return data.tobytes().decode().split("\0")[:-1]
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds every label whose keywords occur in a text"""
+
+    def __init__(self, keywords: Dict[str, set]):
+        # keywords maps keyword -> labels it belongs to
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[frozenset] = [frozenset()]
+
+        for keyword, labels in keywords.items():
+            if not keyword:
+                continue
+            state = 0
+            for char in keyword:
+                nxt = self._goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(frozenset())
+                state = nxt
+            self._out[state] = self._out[state] | frozenset(labels)
+
+        # Breadth-first pass to wire failure links and merge outputs
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] | self._out[self._fail[nxt]]
+
+    def match(self, *texts: str) -> set:
+        """Return every label hit by any of the texts, one pass per text"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        for text in texts:
+            state = 0
+            for char in text:
+                while state and char not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(char, 0)
+                if out[state]:
+                    found |= out[state]
+        return found
+
+class RollingWindow:
+    """Time-bucketed ring buffer with running volume/count totals over a fixed window"""
+
+    def __init__(self, window_seconds: float, bucket_seconds: float = 60.0,
+                 half_life: Optional[float] = None):
+        self.bucket_seconds = bucket_seconds
+        self.size = max(1, math.ceil(window_seconds / bucket_seconds))
+        self._volumes = [0.0] * self.size
+        self._counts = [0] * self.size
+        self._head: Optional[int] = None
+        self.volume = 0.0
+        self.count = 0
+
+        # Optional exponentially decayed aggregates
+        self.half_life = half_life
+        self._decay_rate = math.log(2) / half_life if half_life else 0.0
+        self._decayed_volume = 0.0
+        self._decayed_count = 0.0
+        self._decayed_at = 0.0
+
+    def _advance(self, bucket: int):
+        """Expire buckets that fell out of the window; amortized O(1)"""
+        if self._head is None:
+            self._head = bucket
+            return
+        if bucket <= self._head:
+            return
+        for stale in range(self._head + 1, self._head + 1 + min(bucket - self._head, self.size)):
+            idx = stale % self.size
+            self.volume -= self._volumes[idx]
+            self.count -= self._counts[idx]
+            self._volumes[idx] = 0.0
+            self._counts[idx] = 0
+        if self.count == 0:
+            self.volume = 0.0
+        self._head = bucket
+
+    def add(self, volume: float, now: Optional[float] = None):
+        """Record one observation"""
+        now = time.time() if now is None else now
+        bucket = int(now // self.bucket_seconds)
+        self._advance(bucket)
+        if bucket <= self._head - self.size:
+            return
+
+        idx = bucket % self.size
+        self._volumes[idx] += volume
+        self._counts[idx] += 1
+        self.volume += volume
+        self.count += 1
+
+        if self._decay_rate:
+            factor = math.exp(-self._decay_rate * abs(now - self._decayed_at))
+            if now >= self._decayed_at:
+                self._decayed_volume = self._decayed_volume * factor + volume
+                self._decayed_count = self._decayed_count * factor + 1
+                self._decayed_at = now
+            else:
+                self._decayed_volume += volume * factor
+                self._decayed_count += factor
+
+    def totals(self, now: Optional[float] = None) -> tuple[float, float]:
+        """(volume, count) inside the window, decayed if a half-life is set"""
+        now = time.time() if now is None else now
+        self._advance(int(now // self.bucket_seconds))
+        if self._decay_rate:
+            if self.count == 0:
+                return 0.0, 0.0
+            factor = math.exp(-self._decay_rate * max(0.0, now - self._decayed_at))
+            return self._decayed_volume * factor, self._decayed_count * factor
+        return self.volume, self.count
+
+    def export_state(self) -> tuple[Dict, Dict[str, np.ndarray]]:
+        """Running totals and bucket arrays for a state snapshot"""
+        header = {
+            'bucket_seconds': self.bucket_seconds,
+            'size': self.size,
+            'head': self._head,
+            'volume': self.volume,
+            'count': self.count,
+            'decayed': [self._decayed_volume, self._decayed_count, self._decayed_at]
+        }
+        arrays = {
+            'volumes': np.asarray(self._volumes, dtype=np.float64),
+            'counts': np.asarray(self._counts, dtype=np.int64)
+        }
+        return header, arrays
+
+    def restore_state(self, header: Dict, arrays: Dict[str, np.ndarray]) -> bool:
+        """Reload exported state; skipped if the bucket layout has changed since"""
+        if header['size'] != self.size or header['bucket_seconds'] != self.bucket_seconds:
+            return False
+        self._volumes = arrays['volumes'].tolist()
+        self._counts = arrays['counts'].tolist()
+        self._head = header['head']
+        self.volume = header['volume']
+        self.count = header['count']
+        self._decayed_volume, self._decayed_count, self._decayed_at = header['decayed']
+        return True
+
 class MetaTracker:
-    def __init__(self):
+    def __init__(self, half_life: Optional[timedelta] = None, bucket_seconds: float = 60.0):
         self.current_metas = {
             Meta.AI: {
                 "score": 100,
-                "keywords": ["ai", "gpt", "bot", "agent", "neural", "brain", "intelligence", "machine", "compute"],
-                "volume_24h": 0,
-                "recent_pairs": []
+                "keywords": ["ai", "gpt", "bot", "agent", "neural", "brain", "intelligence", "machine", "compute"]
             },
             Meta.ANIMALS: {
                 "score": 85,
-                "keywords": ["cat", "dog", "hippo", "monkey", "frog", "bird", "animal", "zoo", "pet"],
-                "volume_24h": 0,
-                "recent_pairs": []
+                "keywords": ["cat", "dog", "hippo", "monkey", "frog", "bird", "animal", "zoo", "pet"]
             },
             Meta.VIRAL: {
                 "score": 80,
-                "keywords": ["meme", "viral", "tiktok", "trend", "viral", "internet", "social"],
-                "volume_24h": 0,
-                "recent_pairs": []
+                "keywords": ["meme", "viral", "tiktok", "trend", "viral", "internet", "social"]
             },
             Meta.GAMING: {
                 "score": 75,
-                "keywords": ["game", "play", "minecraft", "quest", "gaming", "player", "console"],
-                "volume_24h": 0,
-                "recent_pairs": []
+                "keywords": ["game", "play", "minecraft", "quest", "gaming", "player", "console"]
             }
         }
         self.momentum_window = timedelta(hours=24)
+        self.half_life = half_life
+        self.bucket_seconds = bucket_seconds
+        for data in self.current_metas.values():
+            data["window"] = self._new_window()
+        self._matcher: Optional[KeywordMatcher] = None
+
+    def _new_window(self) -> RollingWindow:
+        """Rolling momentum window for one meta"""
+        return RollingWindow(
+            self.momentum_window.total_seconds(),
+            self.bucket_seconds,
+            self.half_life.total_seconds() if self.half_life else None
+        )
+
+    def set_keywords(self, meta: Meta, keywords: List[str], score: Optional[float] = None):
+        """Replace a meta's keyword list, registering the meta if it isn't tracked yet"""
+        data = self.current_metas.setdefault(meta, {
+            "score": 50,
+            "keywords": [],
+            "window": self._new_window()
+        })
+        data["keywords"] = [kw.lower() for kw in keywords]
+        if score is not None:
+            data["score"] = score
+        self._matcher = None
 
-    def update_meta(self, pair: Dict):
+    def add_keywords(self, meta: Meta, keywords: List[str]):
+        """Extend a meta's keyword list"""
+        existing = self.current_metas.get(meta, {}).get("keywords", [])
+        self.set_keywords(meta, existing + [kw for kw in keywords if kw.lower() not in existing])
+
+    def _get_matcher(self) -> KeywordMatcher:
+        """Compiled matcher over all meta keywords, rebuilt only after keyword changes"""
+        if self._matcher is None:
+            keyword_map: Dict[str, set] = {}
+            for meta, data in self.current_metas.items():
+                for kw in data["keywords"]:
+                    keyword_map.setdefault(kw, set()).add(meta)
+            self._matcher = KeywordMatcher(keyword_map)
+        return self._matcher
+
+    def update_meta(self, pair: Pair):
         """Update meta stats based on new pair data"""
-        name = pair.get('baseToken', {}).get('name', '').lower()
-        symbol = pair.get('baseToken', {}).get('symbol', '').lower()
-        volume_24h = float(pair.get('volume', {}).get('h24', 0) or 0)
+        name = pair.name.lower()
+        symbol = pair.symbol.lower()
+        volume_24h = pair.volume_24h if not math.isnan(pair.volume_24h) else 0.0
+
+        metas = self._get_matcher().match(name, symbol)
+        if not metas:
+            return
+
+        now = time.time()
+        for meta in metas:
+            self.current_metas[meta]["window"].add(volume_24h, now)
+
+    def get_hot_metas(self) -> List[tuple[Meta, float]]:
+        """Get currently trending metas sorted by momentum"""
+        momentum_scores = {}
+        now = time.time()
+        for meta, data in self.current_metas.items():
+            recent_volume, pair_count = data["window"].totals(now)
+            momentum = (recent_volume * 0.7 + (pair_count * 100000) * 0.3) * (data["score"] / 100)
+            momentum_scores[meta] = momentum
+
+        return sorted(momentum_scores.items(), key=lambda x: x[1], reverse=True)
+
+    def export_state(self) -> tuple[Dict, Dict[str, np.ndarray]]:
+        """Keywords, scores and momentum windows for a state snapshot"""
+        header, arrays = {}, {}
+        for meta, data in self.current_metas.items():
+            window, window_arrays = data["window"].export_state()
+            header[meta.name] = {'score': data["score"], 'keywords': data["keywords"], 'window': window}
+            for name, arr in window_arrays.items():
+                arrays[f"{meta.name}.{name}"] = arr
+        return header, arrays
+
+    def restore_state(self, header: Dict, arrays: Dict[str, np.ndarray]) -> int:
+        """Reload exported metas, returning how many momentum windows were restored"""
+        restored = 0
+        for name, data in header.items():
+            if name not in Meta.__members__:
+                continue
+            meta = Meta[name]
+            self.set_keywords(meta, data['keywords'], data['score'])
+            window_arrays = {
+                key.partition(".")[2]: arr for key, arr in arrays.items() if key.partition(".")[0] == name
+            }
+            restored += self.current_metas[meta]["window"].restore_state(data['window'], window_arrays)
+        return restored
+    
+def _parse_timestamp(value) -> Optional[float]:
+    """Epoch seconds from seconds, milliseconds or ISO-8601"""
+    if value is None or value == "":
+        return None
+    try:
+        ts = float(value)
+        return ts / 1000 if ts > 1e12 else ts
+    except (TypeError, ValueError):
+        pass
+    try:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed.timestamp()
+    except ValueError:
+        return None
+
+class WalletActivityStore:
+    """Inverted index from token mint to the wallets that recently traded it"""
+
+    WALLET_FIELDS = ("wallet", "owner", "signer", "from", "trader")
+    MINT_FIELDS = ("mint", "token", "token_address", "tokenAddress")
+    TIME_FIELDS = ("timestamp", "block_time", "blockTime", "time")
+
+    def __init__(self, window: timedelta = timedelta(hours=24)):
+        self.window = window
+        self._index: Dict[str, Dict[str, float]] = {}
+        self.ingested = 0
+
+    @staticmethod
+    def _first(record: Dict, fields: tuple):
+        for field in fields:
+            value = record.get(field)
+            if value:
+                return value
+        return None
+
+    def record(self, wallet: str, mint: str, timestamp: float):
+        """Index one wallet/mint interaction, keeping the latest timestamp"""
+        wallets = self._index.get(mint)
+        if wallets is None:
+            wallets = self._index[mint] = {}
+        if wallets.get(wallet, 0) < timestamp:
+            wallets[wallet] = timestamp
+
+    def ingest_records(self, records, only_wallets: Optional[set] = None) -> int:
+        """Bulk-ingest transfer/swap records; returns how many were indexed"""
+        cutoff = time.time() - self.window.total_seconds()
+        count = 0
+        for rec in records:
+            wallet = self._first(rec, self.WALLET_FIELDS)
+            mint = self._first(rec, self.MINT_FIELDS)
+            if not wallet or not mint:
+                continue
+            if only_wallets is not None and wallet not in only_wallets:
+                continue
+            ts = _parse_timestamp(self._first(rec, self.TIME_FIELDS))
+            if ts is None or ts < cutoff:
+                continue
+            self.record(wallet, mint, ts)
+            count += 1
+        self.ingested += count
+        return count
+
+    def ingest_file(self, path: str, only_wallets: Optional[set] = None) -> int:
+        """Ingest a JSONL or CSV export of Solana transfers/swaps"""
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if path.endswith(".csv"):
+                return self.ingest_records(csv.DictReader(f), only_wallets)
+            return self.ingest_records(
+                (json.loads(line) for line in f if line.strip()), only_wallets
+            )
+
+    def wallets_for(self, mint: str, now: Optional[float] = None) -> Dict[str, float]:
+        """Wallets active on a mint inside the window, with their last activity time"""
+        wallets = self._index.get(mint)
+        if not wallets:
+            return {}
+        cutoff = (time.time() if now is None else now) - self.window.total_seconds()
+        return {w: ts for w, ts in wallets.items() if ts >= cutoff}
+
+    def has_activity(self, wallet: str, mint: str, now: Optional[float] = None) -> bool:
+        ts = self._index.get(mint, {}).get(wallet)
+        if ts is None:
+            return False
+        return ts >= (time.time() if now is None else now) - self.window.total_seconds()
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Drop interactions that fell out of the window"""
+        cutoff = (time.time() if now is None else now) - self.window.total_seconds()
+        removed = 0
+        for mint in list(self._index):
+            wallets = self._index[mint]
+            stale = [w for w, ts in wallets.items() if ts < cutoff]
+            for wallet in stale:
+                del wallets[wallet]
+            removed += len(stale)
+            if not wallets:
+                del self._index[mint]
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(w) for w in self._index.values())
+
+class WalletRegistry:
+    """Struct-of-arrays registry of tracked whale and KOL wallets with running stats"""
+
+    WHALE = 0
+    KOL = 1
+    TYPE_NAMES = ("whale", "kol")
+    FIELDS = ("address", "name", "type", "success_rate", "followers", "tags", "added_at")
+
+    def __init__(self, capacity: int = 64):
+        self.addresses: List[str] = []
+        self.names: List[str] = []
+        self.tags: List[List[str]] = []
+        self._rows: Dict[str, int] = {}
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.success_rate = np.zeros(capacity, dtype=np.float64)
+        self.followers = np.zeros(capacity, dtype=np.int64)
+        self.added_at = np.zeros(capacity, dtype=np.float64)
+
+        # Running aggregates per wallet type
+        self._counts = [0, 0]
+        self._success_sums = [0.0, 0.0]
+        self._followers_total = 0
+
+    def __len__(self) -> int:
+        return len(self.addresses)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._rows
+
+    def row(self, address: str) -> Optional[int]:
+        return self._rows.get(address)
+
+    def _grow(self, needed: int):
+        capacity = len(self.kind)
+        if needed <= capacity:
+            return
+        capacity = max(needed, capacity * 2)
+        for attr in ("kind", "success_rate", "followers", "added_at"):
+            old = getattr(self, attr)
+            grown = np.zeros(capacity, dtype=old.dtype)
+            grown[:len(old)] = old
+            setattr(self, attr, grown)
+
+    def _account(self, row: int, sign: int):
+        kind = int(self.kind[row])
+        self._counts[kind] += sign
+        self._success_sums[kind] += sign * float(self.success_rate[row])
+        if kind == self.KOL:
+            self._followers_total += sign * int(self.followers[row])
+
+    def add(self, address: str, name: str, kind: int, success_rate: float = 0.0,
+            followers: int = 0, tags: List[str] = None, added_at: Optional[float] = None) -> int:
+        """Insert or update a wallet, returning its row"""
+        row = self._rows.get(address)
+        if row is None:
+            row = len(self.addresses)
+            self._grow(row + 1)
+            self._rows[address] = row
+            self.addresses.append(address)
+            self.names.append(name)
+            self.tags.append(list(tags or []))
+        else:
+            self._account(row, -1)
+            self.names[row] = name
+            self.tags[row] = list(tags or [])
+
+        self.kind[row] = kind
+        self.success_rate[row] = success_rate
+        self.followers[row] = followers if kind == self.KOL else 0
+        self.added_at[row] = time.time() if added_at is None else added_at
+        self._account(row, 1)
+        return row
+
+    def remove(self, address: str) -> bool:
+        """Remove a wallet by moving the last row into its slot"""
+        row = self._rows.pop(address, None)
+        if row is None:
+            return False
+        self._account(row, -1)
+        last = len(self.addresses) - 1
+        if row != last:
+            moved = self.addresses[last]
+            self.addresses[row] = moved
+            self.names[row] = self.names[last]
+            self.tags[row] = self.tags[last]
+            for arr in (self.kind, self.success_rate, self.followers, self.added_at):
+                arr[row] = arr[last]
+            self._rows[moved] = row
+        self.addresses.pop()
+        self.names.pop()
+        self.tags.pop()
+        return True
+
+    def addresses_of(self, kind: int) -> List[str]:
+        size = len(self.addresses)
+        return [self.addresses[row] for row in np.flatnonzero(self.kind[:size] == kind)]
+
+    def get(self, address: str) -> Optional[Dict]:
+        """Wallet record as a dict"""
+        row = self._rows.get(address)
+        if row is None:
+            return None
+        return self._record(row)
+
+    def _record(self, row: int) -> Dict:
+        return {
+            'address': self.addresses[row],
+            'name': self.names[row],
+            'type': self.TYPE_NAMES[int(self.kind[row])],
+            'success_rate': float(self.success_rate[row]),
+            'followers': int(self.followers[row]),
+            'tags': list(self.tags[row]),
+            'added_at': float(self.added_at[row])
+        }
+
+    def add_many(self, records) -> int:
+        """Bulk insert wallet records (dicts with FIELDS keys)"""
+        count = 0
+        for rec in records:
+            kind = rec.get('type', 'whale')
+            tags = rec.get('tags') or []
+            if isinstance(tags, str):
+                tags = [t for t in tags.split("|") if t]
+            added_at = rec.get('added_at')
+            self.add(
+                rec['address'],
+                rec.get('name') or rec['address'],
+                self.KOL if kind == 'kol' else self.WHALE,
+                float(rec.get('success_rate') or 0),
+                int(float(rec.get('followers') or 0)),
+                tags,
+                float(added_at) if added_at not in (None, "") else None
+            )
+            count += 1
+        return count
+
+    def records(self) -> List[Dict]:
+        return [self._record(row) for row in range(len(self.addresses))]
+
+    def import_file(self, path: str) -> int:
+        """Load wallets from CSV, JSON (list of records) or Parquet"""
+        if path.endswith(".csv"):
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                return self.add_many(csv.DictReader(f))
+        if path.endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                return self.add_many(json.load(f))
+        if path.endswith(".parquet"):
+            frame = pd.read_parquet(path)
+            return self.add_many(frame.to_dict("records"))
+        raise ValueError(f"Unsupported wallet file format: {path}")
+
+    def export_file(self, path: str) -> int:
+        """Write every wallet to CSV, JSON or Parquet"""
+        records = self.records()
+        if path.endswith(".csv"):
+            with open(path, "w", encoding="utf-8", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                writer.writeheader()
+                for rec in records:
+                    writer.writerow({**rec, 'tags': "|".join(rec['tags'])})
+        elif path.endswith(".json"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(records, f, indent=2)
+        elif path.endswith(".parquet"):
+            pd.DataFrame(records, columns=self.FIELDS).to_parquet(path, index=False)
+        else:
+            raise ValueError(f"Unsupported wallet file format: {path}")
+        return len(records)
+
+    def export_state(self) -> tuple[Dict, Dict[str, np.ndarray]]:
+        """Wallet columns for a state snapshot; strings are packed, numeric columns stay raw"""
+        size = len(self.addresses)
+        arrays = {
+            'addresses': _pack_strings(self.addresses),
+            'names': _pack_strings(self.names),
+            'tags': _pack_strings(["\x1f".join(tags) for tags in self.tags])
+        }
+        for attr in ("kind", "success_rate", "followers", "added_at"):
+            arrays[attr] = getattr(self, attr)[:size]
+        return {'size': size}, arrays
+
+    def restore_state(self, header: Dict, arrays: Dict[str, np.ndarray]) -> int:
+        """Replace the registry with exported state, adopting the (copy-on-write) arrays as-is"""
+        self.addresses = _unpack_strings(arrays['addresses'])
+        self.names = _unpack_strings(arrays['names'])
+        self.tags = [[t for t in tags.split("\x1f") if t] for tags in _unpack_strings(arrays['tags'])]
+        self._rows = {address: row for row, address in enumerate(self.addresses)}
+        for attr in ("kind", "success_rate", "followers", "added_at"):
+            setattr(self, attr, arrays[attr])
+
+        kols = self.kind == self.KOL
+        self._counts = [int((~kols).sum()), int(kols.sum())]
+        self._success_sums = [float(self.success_rate[~kols].sum()), float(self.success_rate[kols].sum())]
+        self._followers_total = int(self.followers[kols].sum())
+        return len(self.addresses)
+
+    def stats(self) -> Dict:
+        """Wallet statistics from the running aggregates"""
+        whales, kols = self._counts
+        return {
+            'whales': {
+                'count': whales,
+                'avg_success_rate': self._success_sums[self.WHALE] / whales if whales else 0
+            },
+            'kols': {
+                'count': kols,
+                'total_followers': self._followers_total,
+                'avg_success_rate': self._success_sums[self.KOL] / kols if kols else 0
+            }
+        }
+
+class WhaleKOLTracker:
+    def __init__(self, activity: Optional[WalletActivityStore] = None):
+        self.activity = activity if activity is not None else WalletActivityStore()
+        self.registry = WalletRegistry()
+        self.registry.add(
+            "HN4AkYD4N6f4KFYkxFemY6bz2B3qubGtK1r6H3ymYAFS",
+            "Known Whale 1",
+            WalletRegistry.WHALE,
+            success_rate=0.85,
+            tags=["AI trader", "Early adopter"]
+        )
+        self.registry.add(
+            "2MxyVwqWGbsB6RhQvfNQrfEKyDr9fLt2Z5FxQs5vRECF",
+            "KOL 1",
+            WalletRegistry.KOL,
+            success_rate=0.92,
+            followers=50000,
+            tags=["Meme specialist", "High influence"]
+        )
+
+    def add_whale_wallet(self, address: str, name: str, tags: List[str] = None) -> bool:
+        """Add a new whale wallet to track"""
+        try:
+            self.registry.add(address, name, WalletRegistry.WHALE, tags=tags)
+            print(f"Added whale wallet: {name} ({address})")
+            return True
+        except Exception as e:
+            print(f"Error adding whale wallet: {e}")
+            return False
+
+    def add_kol_wallet(self, address: str, name: str, followers: int, tags: List[str] = None) -> bool:
+        """Add a new KOL wallet to track"""
+        try:
+            self.registry.add(address, name, WalletRegistry.KOL, followers=followers, tags=tags)
+            print(f"Added KOL wallet: {name} ({address})")
+            return True
+        except Exception as e:
+            print(f"Error adding KOL wallet: {e}")
+            return False
+
+    def import_wallets(self, path: str) -> int:
+        """Bulk-load whale/KOL wallets from CSV, JSON or Parquet"""
+        count = self.registry.import_file(path)
+        print(f"Imported {count} wallets from {path}")
+        return count
+
+    def export_wallets(self, path: str) -> int:
+        """Write all tracked wallets to CSV, JSON or Parquet"""
+        return self.registry.export_file(path)
+
+    @staticmethod
+    def _empty_analysis() -> Dict:
+        return {
+            'score': 0,
+            'whale_metrics': {'active_whales': [], 'whale_score': 0},
+            'kol_metrics': {'active_kols': [], 'kol_score': 0},
+            'risk_level': 'high'
+        }
+
+    def analyze_wallet_interest(self, pair: Pair) -> Dict:
+        """Analyze whale and KOL interest in a token"""
+        return self.analyze_batch([pair])[0]
+
+    def analyze_batch(self, pairs: List[Pair]) -> List[Dict]:
+        """Analyze whale and KOL interest for many tokens with vectorized scoring"""
+        try:
+            registry = self.registry
+            pair_idx, rows = [], []
+            for idx, pair in enumerate(pairs):
+                contract = pair.token_address
+                # One index lookup gives every wallet active on this token
+                for address in self.activity.wallets_for(contract):
+                    row = registry.row(address)
+                    if row is not None:
+                        pair_idx.append(idx)
+                        rows.append(row)
+
+            count = len(pairs)
+            pair_idx = np.asarray(pair_idx, dtype=np.int64)
+            rows = np.asarray(rows, dtype=np.int64)
+            is_whale = registry.kind[rows] == WalletRegistry.WHALE
+            success = registry.success_rate[rows]
+            influence = np.minimum(registry.followers[rows] / 10000, 10)
+
+            whale_scores = np.bincount(pair_idx, np.where(is_whale, success * 20, 0), count)
+            kol_scores = np.bincount(pair_idx, np.where(is_whale, 0, success * influence * 10), count)
+            whale_counts = np.bincount(pair_idx[is_whale], minlength=count)
+            kol_counts = np.bincount(pair_idx[~is_whale], minlength=count)
+
+            # Combined analysis
+            combined = whale_scores * 0.6 + kol_scores * 0.4
+            risk_levels = self._assess_risk_levels(combined, whale_counts, kol_counts)
+
+            results = [{
+                'score': float(min(100, combined[idx])),
+                'whale_metrics': {
+                    'active_whales': [],
+                    'whale_score': float(whale_scores[idx])
+                },
+                'kol_metrics': {
+                    'active_kols': [],
+                    'kol_score': float(kol_scores[idx])
+                },
+                'risk_level': str(risk_levels[idx])
+            } for idx in range(count)]
+
+            for idx, row, whale in zip(pair_idx.tolist(), rows.tolist(), is_whale.tolist()):
+                if whale:
+                    results[idx]['whale_metrics']['active_whales'].append(registry.names[row])
+                else:
+                    results[idx]['kol_metrics']['active_kols'].append(registry.names[row])
+            return results
+
+        except Exception as e:
+            print(f"Error in wallet analysis: {e}")
+            return [self._empty_analysis() for _ in pairs]
+
+    def _check_wallet_activity(self, wallet_address: str, token_address: str) -> bool:
+        """Check if wallet has recent activity with token"""
+        return self.activity.has_activity(wallet_address, token_address)
+
+    def load_activity(self, path: str, tracked_only: bool = True) -> int:
+        """Ingest a wallet activity export, optionally keeping only tracked wallets"""
+        only = set(self.registry.addresses) if tracked_only else None
+        count = self.activity.ingest_file(path, only)
+        print(f"Loaded {count} wallet activity records from {path}")
+        return count
+
+    @staticmethod
+    def _assess_risk_levels(scores: np.ndarray, whale_counts: np.ndarray,
+                            kol_counts: np.ndarray) -> np.ndarray:
+        """Assess risk level based on wallet activity, for many tokens at once"""
+        return np.select(
+            [
+                (scores >= 80) & (whale_counts >= 2),
+                (scores >= 60) & ((whale_counts >= 1) | (kol_counts >= 2)),
+                (scores < 30) | ((whale_counts == 0) & (kol_counts == 0))
+            ],
+            ["low", "medium", "high"],
+            default="medium"
+        )
+
+    def get_wallet_stats(self) -> Dict:
+        """Get current wallet statistics"""
+        return self.registry.stats()
+
+class JupiterTrader:
+
+    def __init__(self):
+        self.referral_key = "6svoeECRFJvcazjUMbF4axe6Qp55MNm8FB8CkVXjYUqB"
+        self.fees_bps = "50"
+        self.base_url = "https://jup.ag"
+
+    def get_trade_link(self, token_address: str, token_symbol: str) -> str:
+        """Generate Jupiter trading link with referral"""
+        return (
+            f"{self.base_url}/swap/{token_symbol}-SOL"
+            f"?referrer={self.referral_key}&feeBps={self.fees_bps}"
+        )
+
+    def get_quick_links(self, token_data: Dict) -> Dict[str, str]:
+        """Generate all relevant trading and info links"""
+        token_address = token_data.get('contract', '')
+        token_symbol = token_data.get('token_symbol', '')
+
+        return {
+            'jupiter': self.get_trade_link(token_address, token_symbol),
+            'dexscreener': token_data.get('url', ''),
+            'solscan': f"https://solscan.io/token/{token_address}"
+        }
+
+class RateLimiter:
+    """Adaptive token bucket shared by every outgoing DEXScreener request
+
+    Callers blocked on an empty bucket are served highest priority first, then
+    in arrival order, so priority applies where requests actually queue up.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, min_rate: float = 0.5,
+                 max_rate: Optional[float] = None):
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate if max_rate is not None else rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        # Heap of (-priority, arrival) tickets; only the head may take a token
+        self._waiters: List[tuple] = []
+        self._arrivals = itertools.count()
+        self.throttled = 0
+
+    def _refill(self, now: float):
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, priority: int = 0):
+        """Block until a request slot is available; higher `priority` callers go first"""
+        with self._wakeup:
+            ticket = (-priority, next(self._arrivals))
+            heapq.heappush(self._waiters, ticket)
+            try:
+                while True:
+                    wait = None
+                    if self._waiters[0] == ticket:
+                        now = time.monotonic()
+                        if now < self._paused_until:
+                            wait = self._paused_until - now
+                        else:
+                            self._refill(now)
+                            if self._tokens >= 1:
+                                self._tokens -= 1
+                                return
+                            wait = (1 - self._tokens) / self.rate
+                    self._wakeup.wait(wait)
+            finally:
+                if self._waiters[0] == ticket:
+                    heapq.heappop(self._waiters)
+                else:
+                    self._waiters.remove(ticket)
+                    heapq.heapify(self._waiters)
+                # The next head re-checks the bucket
+                self._wakeup.notify_all()
+
+    def record_success(self):
+        """Additively recover towards the configured rate"""
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+
+    def penalize(self, delay: float):
+        """Halve the rate and hold every caller back for `delay` seconds"""
+        with self._lock:
+            self.throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            self._tokens = 0.0
+
+class FixtureAdapter(BaseAdapter):
+    """requests transport that replays (or records) DEXScreener responses offline
+
+    Responses are looked up by a slug of the search query (or the last path
+    segment for other endpoints), first in the in-memory `bodies` map, then as
+    `<slug>.json` in `directory`, then `default.json`.
+    """
+
+    def __init__(self, directory: Optional[str] = None, bodies: Dict[str, bytes] = None,
+                 record: bool = False, latency: float = 0.0):
+        super().__init__()
+        self.directory = directory
+        self.bodies = dict(bodies or {})
+        self.record = record
+        self.latency = latency
+        self.requests = 0
+        self._live = HTTPAdapter() if record else None
+
+    @staticmethod
+    def slug(text: str) -> str:
+        key = ResponseCache.make_key(text)
+        return "".join(c if c.isalnum() else "_" for c in key).strip("_") or "default"
+
+    def _key(self, url: str) -> str:
+        parsed = urlparse(url)
+        query = parse_qs(parsed.query).get('q')
+        if query:
+            return self.slug(query[0])
+        return self.slug(parsed.path.rstrip("/").rsplit("/", 1)[-1])
+
+    def _load(self, key: str) -> Optional[bytes]:
+        body = self.bodies.get(key)
+        if body is None and self.directory:
+            for name in (key, "default"):
+                path = os.path.join(self.directory, f"{name}.json")
+                if os.path.exists(path):
+                    with open(path, "rb") as f:
+                        body = f.read()
+                    break
+        return body
+
+    def send(self, request, stream=False, timeout=None, verify=True, cert=None, proxies=None):
+        self.requests += 1
+        key = self._key(request.url)
+
+        if self.record:
+            response = self._live.send(request, stream=False, timeout=timeout, verify=verify,
+                                       cert=cert, proxies=proxies)
+            if response.status_code == 200 and self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+                with open(os.path.join(self.directory, f"{key}.json"), "wb") as f:
+                    f.write(response.content)
+            # The body has been read; give streaming parsers a fresh raw stream over it
+            response.raw = io.BytesIO(response.content)
+            return response
+
+        if self.latency:
+            time.sleep(self.latency)
+        body = self._load(key)
+
+        response = requests.Response()
+        response.status_code = 200 if body is not None else 404
+        response.reason = "OK" if body is not None else "Not Found"
+        response.headers["Content-Type"] = "application/json"
+        response.raw = io.BytesIO(body if body is not None else b'{"pairs": []}')
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+    def close(self):
+        if self._live is not None:
+            self._live.close()
+
+class ResponseCache:
+    """In-memory LRU with per-query TTL and an optional SQLite tier shared across processes"""
+
+    def __init__(self, max_entries: int = 512, ttl: float = 30.0,
+                 disk_path: Optional[str] = None, ttl_overrides: Dict[str, float] = None,
+                 encode: Callable = None, decode: Callable = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.ttl_overrides = {self.make_key(k): v for k, v in (ttl_overrides or {}).items()}
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        # Disk tier serialization; defaults to compact Pair records
+        self.encode = encode or _encode_pairs
+        self.decode = decode or _decode_pairs
+        self._entries: "OrderedDict[str, tuple[float, list]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            self._open_disk(disk_path)
+
+    @staticmethod
+    def make_key(query: str) -> str:
+        """Normalize a search query so equivalent terms share an entry"""
+        return " ".join(query.lower().split())
+
+    def _open_disk(self, path: str):
+        """Open (or create) the persistent tier"""
+        try:
+            self._db = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS response_cache ("
+                "key TEXT PRIMARY KEY, expires_at REAL NOT NULL, body TEXT NOT NULL)"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Error opening response cache at {path}: {e}")
+            self._db = None
+
+    def ttl_for(self, key: str) -> float:
+        """TTL in seconds for a normalized key"""
+        return self.ttl_overrides.get(key, self.ttl)
+
+    def get(self, query: str) -> Optional[list]:
+        """Return cached pairs for a query, or None if missing/expired"""
+        key = self.make_key(query)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT expires_at, body FROM response_cache WHERE key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error:
+                    row = None
+                try:
+                    value = self.decode(row[1]) if row and row[0] > now else None
+                except (ValueError, TypeError):
+                    value = None
+                if value is not None:
+                    self._remember(key, row[0], value)
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+
+            self.misses += 1
+            return None
+
+    def set(self, query: str, value: list, ttl: Optional[float] = None):
+        """Store pairs for a query in both tiers"""
+        key = self.make_key(query)
+        ttl = self.ttl_for(key) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO response_cache (key, expires_at, body) VALUES (?, ?, ?)",
+                        (key, expires_at, self.encode(value))
+                    )
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"Error writing response cache: {e}")
+
+    def _remember(self, key: str, expires_at: float, value: list):
+        """Insert into the memory tier, evicting least recently used entries"""
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def purge_expired(self) -> int:
+        """Drop expired entries from both tiers"""
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]
+            for key in expired:
+                del self._entries[key]
+            if self._db is not None:
+                try:
+                    self._db.execute("DELETE FROM response_cache WHERE expires_at <= ?", (now,))
+                    self._db.commit()
+                except sqlite3.Error:
+                    pass
+        return len(expired)
+
+    def export_state(self) -> tuple[Dict, Dict[str, np.ndarray]]:
+        """Unexpired memory-tier entries for a state snapshot, least recently used first"""
+        now = time.time()
+        with self._lock:
+            live = [(key, expires_at, value) for key, (expires_at, value) in self._entries.items()
+                    if expires_at > now]
+        arrays = {
+            'keys': _pack_strings([key for key, _, _ in live]),
+            'expires_at': np.array([expires_at for _, expires_at, _ in live], dtype=np.float64),
+            'bodies': _pack_strings([self.encode(value) for _, _, value in live])
+        }
+        return {'entries': len(live)}, arrays
+
+    def restore_state(self, header: Dict, arrays: Dict[str, np.ndarray]) -> int:
+        """Reload exported entries that are still fresh, returning how many were kept"""
+        now = time.time()
+        restored = 0
+        with self._lock:
+            keys = _unpack_strings(arrays['keys'])
+            bodies = _unpack_strings(arrays['bodies'])
+            for key, expires_at, body in zip(keys, arrays['expires_at'].tolist(), bodies):
+                if expires_at <= now:
+                    continue
+                try:
+                    self._remember(key, expires_at, self.decode(body))
+                except (ValueError, TypeError):
+                    continue
+                restored += 1
+        return restored
+
+    def get_stats(self) -> Dict:
+        """Current cache counters"""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'disk_hits': self.disk_hits,
+            'hit_rate': self.hits / lookups if lookups else 0,
+            'entries': len(self._entries)
+        }
+
+class PairTable:
+    """Columnar view over a list of pairs with numeric fields gathered once"""
+
+    COLUMNS = tuple(Pair.NUMERIC_FIELDS)
+
+    def __init__(self, pairs: List[Pair]):
+        self.pairs = pairs
+        self.length = len(pairs)
+        self.columns: Dict[str, np.ndarray] = {}
+        self._set_valid()
+
+    @classmethod
+    def from_columns(cls, columns: Dict[str, np.ndarray]) -> "PairTable":
+        """Table over already-gathered columns (no backing pairs)"""
+        table = cls.__new__(cls)
+        table.pairs = None
+        table.columns = dict(columns)
+        table.length = len(next(iter(columns.values()))) if columns else 0
+        table._set_valid()
+        return table
+
+    def _set_valid(self):
+        # Same rows the row-by-row filter skipped as invalid
+        liquidity, volume, fdv = self['liquidity'], self['volume_24h'], self['fdv']
+        self.valid = (liquidity != 0) & (volume != 0) & (fdv != 0) & ~np.isnan(liquidity + volume + fdv)
+
+    def __len__(self) -> int:
+        return self.length
+
+    def __getitem__(self, column: str) -> np.ndarray:
+        """Column by name, parsed on first access"""
+        values = self.columns.get(column)
+        if values is None:
+            if self.pairs is None:
+                raise KeyError(f"Column {column!r} is not available in this table")
+            if column not in Pair.NUMERIC_FIELDS:
+                raise KeyError(f"Unknown column {column!r}")
+            values = self.columns[column] = np.fromiter(
+                map(attrgetter(column), self.pairs), dtype=np.float64, count=self.length
+            )
+        return values
+
+    @staticmethod
+    def top_candidates(selected: np.ndarray, scores: np.ndarray, limit: int) -> np.ndarray:
+        """Rows of `selected` that can place in the top `limit`, ties with the last place included"""
+        if len(selected) <= limit:
+            return selected
+        cut = len(selected) - limit
+        kth = np.partition(scores[selected], cut)[cut]
+        return selected[scores[selected] >= kth]
+
+    def rank(self, mask: np.ndarray, scores: np.ndarray, limit: Optional[int] = None) -> np.ndarray:
+        """Indices of masked rows by score, highest first, ties by 24h volume then input order
+
+        With a limit only rows that can place are sorted, so ranking costs
+        O(n + k log k) instead of O(n log n).
+        """
+        scores = np.nan_to_num(scores, nan=-np.inf)
+        selected = np.flatnonzero(mask)
+        if limit is not None:
+            selected = self.top_candidates(selected, scores, limit)
+        volumes = np.nan_to_num(self['volume_24h'], nan=0.0)
+        order = selected[np.lexsort((selected, -volumes[selected], -scores[selected]))]
+        return order[:limit] if limit is not None else order
+
+DEFAULT_STRATEGY_RULES = {
+    ScanStrategy.MICRO_CAP.value: {"all": [
+        {"field": "liquidity", "op": ">=", "value": 10000},
+        {"field": "volume_24h", "op": ">=", "value": 30000},
+        {"field": "fdv", "op": "between", "value": [50000, 20000000]}
+    ]},
+    ScanStrategy.SMALL_CAP.value: {"all": [
+        {"field": "liquidity", "op": ">=", "value": 10000},
+        {"field": "volume_24h", "op": ">=", "value": 30000},
+        {"field": "fdv", "op": "between", "value": [100000, 20000000]}
+    ]},
+    ScanStrategy.MID_CAP.value: {"all": [
+        {"field": "liquidity", "op": ">=", "value": 10000},
+        {"field": "volume_24h", "op": ">=", "value": 3000000},
+        {"field": "fdv", "op": "between", "value": [1000000, 3000000]}
+    ]},
+    ScanStrategy.DIP_HUNTING.value: {"all": [
+        {"field": "liquidity", "op": ">=", "value": 10000},
+        {"field": "volume_24h", "op": ">=", "value": 300000},
+        {"field": "fdv", "op": "between", "value": [100000, 10000000]},
+        {"field": "price_change_24h", "op": "<", "value": -10}
+    ]}
+}
+
+class StrategyRules:
+    """Declarative strategy rules compiled into shared, vectorized predicates
+
+    A rule is either a comparison ``{"field", "op", "value"}`` or a combinator
+    ``{"all": [...]}``, ``{"any": [...]}`` or ``{"not": rule}``. Identical
+    sub-expressions across strategies compile to the same node and are
+    evaluated once per table.
+    """
+
+    OPERATORS = {
+        '>=': np.greater_equal,
+        '>': np.greater,
+        '<=': np.less_equal,
+        '<': np.less,
+        '==': np.equal,
+        '!=': np.not_equal
+    }
+
+    def __init__(self, definitions: Dict[str, Dict]):
+        self.definitions = definitions
+        self.compiled: Dict[str, tuple] = {
+            name: self._compile(rule, name) for name, rule in definitions.items()
+        }
+
+    @classmethod
+    def from_file(cls, path: str) -> "StrategyRules":
+        """Load rules from a JSON or YAML file (`{"strategies": {name: rule}}` or `{name: rule}`)"""
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith((".yaml", ".yml")):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ValueError("PyYAML is required to load YAML strategy rules")
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+        return cls(data.get("strategies", data))
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.compiled)
+
+    def _compile(self, node: Dict, name: str) -> tuple:
+        """Turn a rule into a canonical, hashable expression tuple"""
+        if not isinstance(node, dict):
+            raise ValueError(f"Strategy {name}: rule must be an object, got {node!r}")
+
+        if "field" in node:
+            field, op, value = node["field"], node.get("op"), node.get("value")
+            if field not in PairTable.COLUMNS:
+                raise ValueError(f"Strategy {name}: unknown field {field!r}")
+            if op == "between":
+                if not isinstance(value, (list, tuple)) or len(value) != 2:
+                    raise ValueError(f"Strategy {name}: 'between' on {field} needs a [low, high] value, got {value!r}")
+                low, high = (self._number(v, name, field) for v in value)
+                return self._combine("all", [("cmp", field, ">=", low), ("cmp", field, "<=", high)])
+            if op not in self.OPERATORS:
+                raise ValueError(f"Strategy {name}: unknown operator {op!r}")
+            return ("cmp", field, op, self._number(value, name, field))
+
+        if "not" in node:
+            return ("not", self._compile(node["not"], name))
+
+        for kind in ("all", "any"):
+            if kind in node:
+                return self._combine(kind, [self._compile(child, name) for child in node[kind]])
+
+        raise ValueError(f"Strategy {name}: unrecognised rule {node!r}")
+
+    @staticmethod
+    def _number(value, name: str, field: str) -> float:
+        """A comparison value as a float, or a ValueError naming the strategy"""
+        try:
+            if isinstance(value, bool):
+                raise TypeError(value)
+            return float(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"Strategy {name}: {field} must be compared with a number, got {value!r}")
+
+    @staticmethod
+    def _combine(kind: str, children: List[tuple]) -> tuple:
+        """Flatten, dedupe and order children so equivalent rules share a node"""
+        flat = set()
+        for child in children:
+            if child[0] == kind:
+                flat.update(child[1:])
+            else:
+                flat.add(child)
+        ordered = sorted(flat, key=repr)
+        return ordered[0] if len(ordered) == 1 else (kind, *ordered)
+
+    def evaluate(self, table: PairTable, names: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        """Row mask per strategy; invalid rows never match"""
+        memo: Dict[tuple, np.ndarray] = {}
+        return {
+            name: table.valid & self._evaluate(self.compiled[name], table, memo)
+            for name in (names if names is not None else self.names)
+        }
+
+    def _evaluate(self, expr: tuple, table: PairTable, memo: Dict[tuple, np.ndarray]) -> np.ndarray:
+        mask = memo.get(expr)
+        if mask is not None:
+            return mask
+
+        kind = expr[0]
+        if kind == "cmp":
+            _, field, op, value = expr
+            mask = self.OPERATORS[op](table[field], value)
+        elif kind == "not":
+            mask = ~self._evaluate(expr[1], table, memo)
+        else:
+            reduce = np.logical_and.reduce if kind == "all" else np.logical_or.reduce
+            mask = reduce([self._evaluate(child, table, memo) for child in expr[1:]])
+
+        memo[expr] = mask
+        return mask
+
+def _wallet_scores(table: PairTable, pairs: List[Pair]) -> np.ndarray:
+    return np.fromiter(
+        ((pair.wallet_analysis or {}).get('score', 0.0) for pair in pairs),
+        dtype=np.float64, count=len(pairs)
+    )
+
+# Vectorized ranking keys over a batch: (table, pairs) -> score per row, higher ranks first
+RANKING_KEYS: Dict[str, Callable[[PairTable, List[Pair]], np.ndarray]] = {
+    'volume': lambda table, pairs: table['volume_24h'],
+    'momentum': lambda table, pairs: table['price_change_1h'] + table['price_change_5m'],
+    'wallet_score': _wallet_scores
+}
+
+def ranking_key(key) -> Callable[[PairTable, List[Pair]], np.ndarray]:
+    """Resolve a ranking key name (or pass through a callable)"""
+    if callable(key):
+        return key
+    if key not in RANKING_KEYS:
+        raise ValueError(f"Unknown ranking key {key!r}, expected one of {sorted(RANKING_KEYS)}")
+    return RANKING_KEYS[key]
+
+class Leaderboard:
+    """Bounded top-K pairs for one strategy, kept in a min-heap as results stream in"""
+
+    def __init__(self, k: int = 20):
+        self.k = max(1, k)
+        # (score, volume, -arrival, address): the weakest entry sits at the root
+        self._heap: List[tuple] = []
+        self._entries: Dict[str, tuple] = {}
+        self._pairs: Dict[str, Pair] = {}
+        self._arrivals = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    @property
+    def threshold(self) -> float:
+        """Score a new pair must reach to get onto a full board"""
+        return self._heap[0][0] if len(self._heap) >= self.k else -math.inf
+
+    def offer(self, pair: Pair, score: float, volume: float = 0.0) -> bool:
+        """Insert or refresh a pair, evicting the weakest entry when full; True if the board changed"""
+        address = pair.pair_address
+        current = self._entries.get(address)
+        if current is not None:
+            # A pair seen again from another query replaces its own entry
+            entry = (score, volume, current[2], address)
+            self._heap[self._heap.index(current)] = entry
+            heapq.heapify(self._heap)
+        else:
+            entry = (score, volume, -next(self._arrivals), address)
+            if len(self._heap) < self.k:
+                heapq.heappush(self._heap, entry)
+            elif entry > self._heap[0]:
+                evicted = heapq.heapreplace(self._heap, entry)[3]
+                del self._entries[evicted]
+                del self._pairs[evicted]
+            else:
+                return False
+        self._entries[address] = entry
+        self._pairs[address] = pair
+        return True
+
+    def top(self) -> List[Pair]:
+        """Current leaders, best first, ties in arrival order"""
+        return [self._pairs[entry[3]] for entry in sorted(self._heap, reverse=True)]
+
+class Leaderboards:
+    """Per-strategy leaderboards sharing one pluggable ranking key"""
+
+    def __init__(self, names: List[str], k: int = 20, key='volume'):
+        self.names = list(names)
+        self.key = ranking_key(key)
+        self.boards = {name: Leaderboard(k) for name in self.names}
+
+    def offer(self, table: PairTable, pairs: List[Pair], masks: Dict[str, np.ndarray]) -> List[str]:
+        """Offer a batch of rows matched per strategy, returning the strategies whose board changed"""
+        scores = np.nan_to_num(self.key(table, pairs), nan=-np.inf)
+        volumes = np.nan_to_num(table['volume_24h'], nan=0.0)
+        changed = []
+        for name, board in self.boards.items():
+            # Only rows that could make the board, in input order so ties keep arrival order
+            candidates = np.flatnonzero(masks[name] & (scores >= board.threshold))
+            candidates = PairTable.top_candidates(candidates, scores, board.k)
+            updated = False
+            for idx in candidates:
+                updated |= board.offer(pairs[idx], float(scores[idx]), float(volumes[idx]))
+            if updated:
+                changed.append(name)
+        return changed
+
+    def top(self, name: str) -> List[Pair]:
+        return self.boards[name].top()
+
+    def results(self) -> Dict[str, List[Pair]]:
+        """Current leaders for every strategy, keyed by strategy name"""
+        return {name: board.top() for name, board in self.boards.items()}
+
+class SnapshotStore:
+    """Append-only SQLite (WAL) history of pair snapshots, written by a background thread"""
+
+    # Names match PairTable columns, which parse them
+    COLUMNS = ("price_usd", "liquidity", "volume_24h", "fdv",
+               "price_change_5m", "price_change_1h", "price_change_6h", "price_change_24h")
+
+    def __init__(self, path: str, batch_size: int = 5000, max_pending: int = 1000):
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self.dropped = 0
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_pending)
+        self._closed = False
+
+        conn = self._connect()
+        columns = ", ".join(f"{name} REAL" for name in self.COLUMNS)
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS snapshots ("
+            f"pair_address TEXT NOT NULL, ts REAL NOT NULL, {columns}, "
+            f"PRIMARY KEY (pair_address, ts)) WITHOUT ROWID"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS snapshots_ts ON snapshots (ts)")
+        conn.commit()
+        conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="snapshot-writer", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def is_database(path: str) -> bool:
+        """Whether a file is a SQLite database rather than a JSONL dump"""
+        try:
+            with open(path, "rb") as f:
+                return f.read(16) == b"SQLite format 3\x00"
+        except OSError:
+            return False
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def record(self, pairs: List[Pair], timestamp: Optional[float] = None) -> bool:
+        """Queue a batch of pairs for writing; never blocks the scan"""
+        if self._closed or not pairs:
+            return False
+        try:
+            self._queue.put_nowait((time.time() if timestamp is None else timestamp, pairs))
+            return True
+        except queue.Full:
+            self.dropped += len(pairs)
+            return False
+
+    def _rows(self, timestamp: float, pairs: List[Pair]) -> List[tuple]:
+        pairs = [pair for pair in pairs if pair.pair_address]
+        table = PairTable(pairs)
+        columns = [table[name].tolist() for name in self.COLUMNS]
+        return list(zip(
+            (pair.pair_address for pair in pairs),
+            [timestamp] * len(pairs),
+            *columns
+        ))
+
+    def _write_loop(self):
+        conn = self._connect()
+        placeholders = ", ".join("?" * (len(self.COLUMNS) + 2))
+        sql = f"INSERT OR IGNORE INTO snapshots VALUES ({placeholders})"
+        pending = []
+        taken = 0
+        stop = False
+        while not stop:
+            timestamp, pairs = self._queue.get()
+            taken += 1
+            if pairs is None:
+                stop = True
+            else:
+                pending.extend(self._rows(timestamp, pairs))
+
+            # Coalesce whatever is already queued into one transaction
+            if stop or len(pending) >= self.batch_size or self._queue.empty():
+                if pending:
+                    try:
+                        conn.executemany(sql, pending)
+                        conn.commit()
+                        self.written += len(pending)
+                    except sqlite3.Error as e:
+                        print(f"Error writing snapshots: {e}")
+                    pending = []
+                for _ in range(taken):
+                    self._queue.task_done()
+                taken = 0
+        conn.close()
+
+    def flush(self):
+        """Block until every queued snapshot is on disk"""
+        self._queue.join()
+
+    def close(self):
+        """Flush and stop the writer thread"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((0, None))
+        self._writer.join()
+
+    def history(self, pair_addresses: List[str], start: Optional[float] = None,
+                end: Optional[float] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """Per-pair time series ({'ts': ..., column: ...}) for a time range"""
+        conn = self._connect()
+        try:
+            conn.execute("CREATE TEMP TABLE wanted (pair_address TEXT PRIMARY KEY)")
+            conn.executemany("INSERT OR IGNORE INTO wanted VALUES (?)", ((a,) for a in pair_addresses))
+            # CROSS JOIN pins the address list as the outer loop, so each pair is
+            # one primary-key range seek and rows come out already ordered
+            rows = conn.execute(
+                "SELECT s.* FROM wanted w CROSS JOIN snapshots s "
+                "ON s.pair_address = w.pair_address AND s.ts >= ? AND s.ts <= ? "
+                "ORDER BY w.pair_address, s.ts",
+                (start if start is not None else -1e308, end if end is not None else 1e308)
+            ).fetchall()
+        finally:
+            conn.close()
+        return self._split(rows)
+
+    def range(self, start: float, end: float) -> Dict[str, Dict[str, np.ndarray]]:
+        """Every pair's time series inside a time range"""
+        conn = self._connect()
+        try:
+            first, last = conn.execute("SELECT min(ts), max(ts) FROM snapshots").fetchone()
+            if first is not None and start <= first and last <= end:
+                # The whole table: a primary-key scan is already in order, where
+                # the ts index would need every row sorted in a temp B-tree
+                rows = conn.execute("SELECT * FROM snapshots ORDER BY pair_address, ts").fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM snapshots WHERE ts >= ? AND ts <= ? ORDER BY pair_address, ts",
+                    (start, end)
+                ).fetchall()
+        finally:
+            conn.close()
+        return self._split(rows)
+
+    def _split(self, rows: List[tuple]) -> Dict[str, Dict[str, np.ndarray]]:
+        if not rows:
+            return {}
+        # One flat pass over the rows is cheaper than letting np.array walk the tuples
+        width = len(self.COLUMNS) + 2
+        table = np.fromiter(itertools.chain.from_iterable(rows), dtype=object,
+                            count=len(rows) * width).reshape(len(rows), width)
+        addresses = table[:, 0]
+        # Column-major so each pair's series are contiguous; NULLs (unparseable numbers) become NaN
+        values = np.array(table[:, 1:].T, dtype=np.float64, order="C")
+        bounds = (np.flatnonzero(addresses[1:] != addresses[:-1]) + 1).tolist()
+
+        names = ('ts',) + self.COLUMNS
+        history = {}
+        for start, stop in zip([0] + bounds, bounds + [len(rows)]):
+            history[addresses[start]] = dict(zip(names, values[:, start:stop]))
+        return history
+
+class Backtester:
+    """Vectorized replay of strategy rules over recorded pair history"""
+
+    HORIZONS = {'1h': 3600, '6h': 6 * 3600, '24h': 24 * 3600}
+
+    def __init__(self, columns: Dict[str, np.ndarray], pair_ids: np.ndarray, timestamps: np.ndarray,
+                 pair_addresses: List[str], horizons: Dict[str, float] = None, tolerance: float = 0.25):
+        # Rows sorted by (pair, time) so each pair's history is one contiguous block
+        order = np.lexsort((timestamps, pair_ids))
+        self.pair_ids = np.asarray(pair_ids)[order]
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)[order]
+        self.pair_addresses = pair_addresses
+        self.table = PairTable.from_columns({name: values[order] for name, values in columns.items()})
+        self.horizons = horizons or dict(self.HORIZONS)
+        self.tolerance = tolerance
+        self.forward_returns: Dict[str, np.ndarray] = {}
+        self.drawdowns: Dict[str, np.ndarray] = {}
+        self._compute_forward()
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def _compute_forward(self):
+        """Forward return and worst drawdown per row and horizon, for the whole history at once"""
+        count = len(self)
+        price = self.table['price_usd']
+        entry_ok = np.isfinite(price) & (price > 0)
+        if count == 0:
+            for label in self.horizons:
+                self.forward_returns[label] = np.empty(0)
+                self.drawdowns[label] = np.empty(0)
+            return
+
+        # One sorted key across all pairs: pair blocks are spaced further apart than any horizon
+        t0 = self.timestamps.min()
+        spacing = (self.timestamps.max() - t0) + max(self.horizons.values()) * 2 + 1
+        key = self.pair_ids * spacing + (self.timestamps - t0)
+        padded = np.append(price, np.nan)
+
+        for label, horizon in self.horizons.items():
+            exit_idx = np.searchsorted(key, key + horizon, side='left')
+            in_range = exit_idx < count
+            exit_idx = np.where(in_range, exit_idx, count - 1)
+            ok = (
+                in_range & entry_ok &
+                (self.pair_ids[exit_idx] == self.pair_ids) &
+                (self.timestamps[exit_idx] - self.timestamps - horizon <= horizon * self.tolerance)
+            )
+            exit_price = price[exit_idx]
+            ok &= np.isfinite(exit_price) & (exit_price > 0)
+
+            returns = np.full(count, np.nan)
+            returns[ok] = exit_price[ok] / price[ok] - 1
+
+            # Lowest price over (entry, exit] via interleaved fmin.reduceat windows
+            drawdown = np.full(count, np.nan)
+            rows = np.flatnonzero(ok)
+            if len(rows):
+                bounds = np.empty(len(rows) * 2, dtype=np.int64)
+                bounds[0::2] = rows + 1
+                bounds[1::2] = exit_idx[rows] + 1
+                lows = np.fmin.reduceat(padded, bounds)[0::2]
+                drawdown[rows] = np.minimum(lows / price[rows] - 1, 0)
+
+            self.forward_returns[label] = returns
+            self.drawdowns[label] = drawdown
+
+    @classmethod
+    def from_snapshots(cls, snapshots, **kwargs) -> "Backtester":
+        """Build from an iterable of (timestamp, pairs) snapshots"""
+        address_ids: Dict[str, int] = {}
+        chunks: Dict[str, List[np.ndarray]] = {name: [] for name in PairTable.COLUMNS}
+        id_chunks, ts_chunks = [], []
+
+        for timestamp, pairs in snapshots:
+            unique = MemecoinScanner.dedupe_pairs(
+                [Pair.from_raw(p) for p in pairs if p.get('chainId', 'solana') == 'solana']
+            )
+            if not unique:
+                continue
+            table = PairTable(list(unique.values()))
+            for name in PairTable.COLUMNS:
+                chunks[name].append(table[name])
+            id_chunks.append(np.fromiter(
+                (address_ids.setdefault(a, len(address_ids)) for a in unique),
+                dtype=np.int64, count=len(unique)
+            ))
+            ts_chunks.append(np.full(len(unique), timestamp, dtype=np.float64))
+
+        if not id_chunks:
+            columns = {name: np.empty(0) for name in PairTable.COLUMNS}
+            return cls(columns, np.empty(0, dtype=np.int64), np.empty(0), [], **kwargs)
+
+        columns = {name: np.concatenate(parts) for name, parts in chunks.items()}
+        return cls(columns, np.concatenate(id_chunks), np.concatenate(ts_chunks),
+                   list(address_ids), **kwargs)
+
+    @classmethod
+    def from_jsonl(cls, paths: List[str], **kwargs) -> "Backtester":
+        """Build from JSONL dumps: one `{"timestamp": ..., "pairs": [...]}` response per line"""
+        def snapshots():
+            for path in paths:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        if not line.strip():
+                            continue
+                        record = _json_loads(line)
+                        timestamp = _parse_timestamp(
+                            record.get('timestamp') or record.get('fetched_at') or record.get('ts')
+                        )
+                        if timestamp is not None:
+                            yield timestamp, record.get('pairs') or []
+        return cls.from_snapshots(snapshots(), **kwargs)
+
+    @classmethod
+    def from_snapshot_store(cls, store: SnapshotStore, start: float = 0.0,
+                            end: float = 1e308, **kwargs) -> "Backtester":
+        """Build from a SnapshotStore time range"""
+        history = store.range(start, end)
+        addresses = list(history)
+        columns = {
+            name: np.concatenate([history[a][name] for a in addresses]) if addresses else np.empty(0)
+            for name in SnapshotStore.COLUMNS
+        }
+        pair_ids = np.concatenate([
+            np.full(len(history[a]['ts']), idx, dtype=np.int64) for idx, a in enumerate(addresses)
+        ]) if addresses else np.empty(0, dtype=np.int64)
+        timestamps = np.concatenate([history[a]['ts'] for a in addresses]) if addresses else np.empty(0)
+        return cls(columns, pair_ids, timestamps, addresses, **kwargs)
+
+    def run(self, rules: StrategyRules) -> Dict[str, Dict[str, Dict]]:
+        """Per-strategy, per-horizon pick statistics"""
+        masks = rules.evaluate(self.table)
+        report = {}
+        for name, mask in masks.items():
+            report[name] = {}
+            for label in self.horizons:
+                returns = self.forward_returns[label][mask]
+                drawdowns = self.drawdowns[label][mask]
+                scored = ~np.isnan(returns)
+                returns, drawdowns = returns[scored], drawdowns[scored]
+                report[name][label] = {
+                    'picks': int(mask.sum()),
+                    'scored': int(scored.sum()),
+                    'hit_rate': float((returns > 0).mean()) if len(returns) else 0.0,
+                    'avg_return': float(returns.mean()) if len(returns) else 0.0,
+                    'median_return': float(np.median(returns)) if len(returns) else 0.0,
+                    'avg_drawdown': float(drawdowns.mean()) if len(drawdowns) else 0.0,
+                    'max_drawdown': float(drawdowns.min()) if len(drawdowns) else 0.0
+                }
+        return report
+
+    def picks(self, rules: StrategyRules, name: str) -> List[Dict]:
+        """Every pick a strategy made, with its forward returns and drawdowns"""
+        mask = rules.evaluate(self.table, [name])[name]
+        rows = np.flatnonzero(mask)
+        return [{
+            'pair_address': self.pair_addresses[self.pair_ids[row]],
+            'timestamp': float(self.timestamps[row]),
+            'price_usd': float(self.table['price_usd'][row]),
+            'returns': {label: float(self.forward_returns[label][row]) for label in self.horizons},
+            'drawdowns': {label: float(self.drawdowns[label][row]) for label in self.horizons}
+        } for row in rows]
+
+    @staticmethod
+    def expand_grid(template: Dict[str, Dict], params: Dict[str, List]) -> List[tuple[Dict, Dict]]:
+        """Substitute every combination of params into "$name" placeholders of a rule template"""
+        def substitute(node, values):
+            if isinstance(node, dict):
+                return {k: substitute(v, values) for k, v in node.items()}
+            if isinstance(node, list):
+                return [substitute(v, values) for v in node]
+            if isinstance(node, str) and node.startswith("$") and node[1:] in values:
+                return values[node[1:]]
+            return node
+
+        names = list(params)
+        combos = []
+        for combo in itertools.product(*(params[n] for n in names)):
+            values = dict(zip(names, combo))
+            combos.append((values, substitute(template, values)))
+        return combos
+
+    def sweep(self, grid: List[tuple[Dict, Dict]], processes: Optional[int] = None) -> List[Dict]:
+        """Run every (params, definitions) combination across a process pool"""
+        definitions = [defs for _, defs in grid]
+        if processes == 1 or len(definitions) <= 1:
+            reports = [self.run(StrategyRules(defs)) for defs in definitions]
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=processes, initializer=_init_backtest_worker,
+                                                        initargs=(self,)) as executor:
+                reports = list(executor.map(_run_backtest_worker, definitions,
+                                            chunksize=max(1, len(definitions) // (4 * (processes or os.cpu_count() or 1)))))
+        return [{'params': params, 'report': report} for (params, _), report in zip(grid, reports)]
+
+_backtest_worker: Optional[Backtester] = None
+
+def _init_backtest_worker(backtester: Backtester):
+    global _backtest_worker
+    _backtest_worker = backtester
+
+def _run_backtest_worker(definitions: Dict) -> Dict:
+    return _backtest_worker.run(StrategyRules(definitions))
+
+class _Timer:
+    """Context manager observing its elapsed seconds into a histogram"""
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+
+    def __init__(self, metrics: 'Metrics', name: str, labels: Dict):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_TIMER = _NullTimer()
+
+class Metrics:
+    """Thread-safe counters, gauges and histograms, exported as Prometheus text or JSON
+
+    A disabled instance returns from every call before taking the lock, so the
+    instrumentation stays in place at close to no cost.
+    """
+
+    BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self, enabled: bool = True, buckets: Optional[tuple] = None):
+        self.enabled = enabled
+        self.buckets = tuple(buckets or self.BUCKETS)
+        self.counters: Dict[tuple, float] = {}
+        self.gauges: Dict[tuple, float] = {}
+        # Per-bucket counts followed by sum and count
+        self.histograms: Dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._dump_path = None
+        self._stop = threading.Event()
+        self._dumper = None
+
+    @staticmethod
+    def _key(name: str, labels: Dict) -> tuple:
+        return (name, tuple(sorted(labels.items())) if labels else ())
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def set(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self._lock:
+            self.gauges[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            hist = self.histograms.get(key)
+            if hist is None:
+                hist = self.histograms[key] = [0] * len(self.buckets) + [0.0, 0]
+            if idx < len(self.buckets):
+                hist[idx] += 1
+            hist[-2] += value
+            hist[-1] += 1
+
+    def timer(self, name: str, **labels):
+        """Context manager timing its block into histogram `name`"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def snapshot(self) -> Dict:
+        """Every series as plain JSON-serialisable data"""
+        with self._lock:
+            counters = list(self.counters.items())
+            gauges = list(self.gauges.items())
+            histograms = [(key, list(hist)) for key, hist in self.histograms.items()]
+
+        result = {'timestamp': time.time(), 'counters': {}, 'gauges': {}, 'histograms': {}}
+        for section, series in (('counters', counters), ('gauges', gauges)):
+            for (name, labels), value in series:
+                result[section].setdefault(name, []).append({'labels': dict(labels), 'value': value})
+        for (name, labels), hist in histograms:
+            result['histograms'].setdefault(name, []).append({
+                'labels': dict(labels),
+                'buckets': dict(zip(map(str, self.buckets), itertools.accumulate(hist[:-2]))),
+                'sum': hist[-2],
+                'count': hist[-1]
+            })
+        return result
+
+    @staticmethod
+    def _labels(labels: Dict, extra: str = "") -> str:
+        parts = [
+            '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+            for k, v in labels.items()
+        ]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    @staticmethod
+    def _number(value: float) -> str:
+        """Full-precision sample value; a short format would round large counters and break rate()"""
+        value = float(value)
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "+Inf" if value > 0 else "-Inf"
+        return repr(value)
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for section, kind in (('counters', 'counter'), ('gauges', 'gauge')):
+            for name, series in sorted(snapshot[section].items()):
+                lines.append(f"# TYPE {name} {kind}")
+                for item in series:
+                    lines.append(f"{name}{self._labels(item['labels'])} {self._number(item['value'])}")
+        for name, series in sorted(snapshot['histograms'].items()):
+            lines.append(f"# TYPE {name} histogram")
+            for item in series:
+                buckets = list(item['buckets'].items()) + [("+Inf", item['count'])]
+                for bound, count in buckets:
+                    labels = self._labels(item['labels'], 'le="%s"' % bound)
+                    lines.append(f"{name}_bucket{labels} {count}")
+                lines.append(f"{name}_sum{self._labels(item['labels'])} {self._number(item['sum'])}")
+                lines.append(f"{name}_count{self._labels(item['labels'])} {item['count']}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int, host: str = "127.0.0.1") -> int:
+        """Serve /metrics from a daemon thread, returning the bound port"""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="metrics-http", daemon=True).start()
+        return self._server.server_address[1]
+
+    def dump(self, path: str):
+        """Write a JSON snapshot atomically"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def start_dump(self, path: str, interval: float = 15.0):
+        """Dump a JSON snapshot every `interval` seconds from a daemon thread"""
+        self._dump_path = path
+
+        def loop():
+            while not self._stop.wait(interval):
+                try:
+                    self.dump(path)
+                except OSError as e:
+                    print(f"Error writing metrics: {e}")
+
+        self._dumper = threading.Thread(target=loop, name="metrics-dump", daemon=True)
+        self._dumper.start()
+
+    def close(self):
+        """Stop exporting, writing a final JSON snapshot if dumping"""
+        self._stop.set()
+        if self._dumper is not None:
+            self._dumper.join()
+            self._dumper = None
+        if self._dump_path:
+            self.dump(self._dump_path)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+class Watchlist:
+    """Known token and pair addresses, refreshed in batches by priority and staleness"""
+
+    KINDS = ('token', 'pair')
+    MAX_BATCH = 30  # addresses per DEXScreener multi-address request
+
+    def __init__(self, interval: float = 60.0):
+        self.interval = interval
+        # (kind, address) -> {'priority', 'interval', 'refreshed'}
+        self.entries: Dict[tuple, Dict] = {}
+        # Latest pairs from refreshes, kept between them so skipped entries still report
+        self.pairs: Dict[str, Pair] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def add(self, address: str, kind: str = 'token', priority: int = 0,
+            interval: Optional[float] = None) -> bool:
+        """Watch an address; re-adding one updates its priority and interval"""
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown watchlist kind {kind!r}, expected one of {self.KINDS}")
+        if not address:
+            return False
+        entry = self.entries.setdefault((kind, address), {'refreshed': None})
+        entry['priority'] = int(priority or 0)
+        entry['interval'] = float(interval) if interval not in (None, "") else self.interval
+        return True
+
+    def add_many(self, records) -> int:
+        """Add records (dicts with address and optional kind/priority/interval, or bare addresses)"""
+        added = 0
+        for rec in records:
+            if isinstance(rec, str):
+                rec = {'address': rec}
+            added += self.add(
+                (rec.get('address') or '').strip(),
+                (rec.get('kind') or 'token').strip().lower(),
+                rec.get('priority') or 0,
+                rec.get('interval')
+            )
+        return added
+
+    def load_file(self, path: str) -> int:
+        """Load addresses from CSV, JSON (list of records or addresses) or one address per line"""
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            if path.endswith(".csv"):
+                return self.add_many(csv.DictReader(f))
+            if path.endswith(".json"):
+                return self.add_many(json.load(f))
+            return self.add_many(line.strip() for line in f if line.strip() and not line.startswith("#"))
+
+    def remove(self, address: str, kind: str = 'token') -> bool:
+        if self.entries.pop((kind, address), None) is None:
+            return False
+        field = 'token_address' if kind == 'token' else 'pair_address'
+        for pair_address in [a for a, p in self.pairs.items() if getattr(p, field) == address]:
+            del self.pairs[pair_address]
+        return True
+
+    def plan(self, now: Optional[float] = None, max_requests: Optional[int] = None) -> List[tuple]:
+        """Due addresses as (kind, [addresses]) batches, most urgent first
+
+        Entries never refreshed come first, then by priority, then by how long
+        they are overdue. Each request carries up to MAX_BATCH addresses.
+        """
+        now = time.time() if now is None else now
+        due = []
+        for (kind, address), entry in self.entries.items():
+            refreshed = entry['refreshed']
+            overdue = math.inf if refreshed is None else now - refreshed - entry['interval']
+            if overdue >= 0:
+                due.append((refreshed is not None, -entry['priority'], -overdue, kind, address))
+        due.sort()
+
+        # Fill batches per endpoint in urgency order; a batch is as urgent as its first address
+        batches = []
+        open_batch = {}
+        for _, _, _, kind, address in due:
+            batch = open_batch.get(kind)
+            if batch is None or len(batch[1]) >= self.MAX_BATCH:
+                if max_requests is not None and len(batches) >= max_requests:
+                    continue
+                batch = open_batch[kind] = (kind, [])
+                batches.append(batch)
+            batch[1].append(address)
+        return batches
+
+    def mark_refreshed(self, kind: str, addresses: List[str], pairs: List[Pair],
+                       now: Optional[float] = None):
+        """Record a successful refresh of one batch and keep its pairs"""
+        now = time.time() if now is None else now
+        for address in addresses:
+            entry = self.entries.get((kind, address))
+            if entry is not None:
+                entry['refreshed'] = now
+
+        # Pairs that no longer come back for these addresses are dropped
+        refreshed = set(addresses)
+        field = 'token_address' if kind == 'token' else 'pair_address'
+        for pair_address in [a for a, p in self.pairs.items() if getattr(p, field) in refreshed]:
+            del self.pairs[pair_address]
+        for pair in pairs:
+            self.pairs[pair.pair_address] = pair
+
+class AlertEngine:
+    """Alert rules evaluated on each cycle's pair updates against the previous cycle's state
+
+    Each rule has a ``name`` and any of:
+      ``when``    a strategy-style rule on the current values,
+      ``change``  ``{"field", "op", "value"}`` on the percent change since the pair was last seen,
+      ``enters``  a strategy name the pair has just started matching,
+    all of which must hold. A rule fires at most once per pair per ``cooldown`` seconds.
+    """
+
+    def __init__(self, definitions: List[Dict], strategies: StrategyRules, cooldown: float = 300.0,
+                 state_ttl: float = 86400.0):
+        self.definitions = definitions
+        self.strategies = strategies
+        self.cooldown = cooldown
+        self.state_ttl = state_ttl
+        for rule in definitions:
+            name = rule.get('name')
+            if not name or not any(key in rule for key in ('when', 'change', 'enters')):
+                raise ValueError(f"Alert {name!r} needs a name and one of 'when', 'change' or 'enters'")
+            change = rule.get('change')
+            if change and (change.get('field') not in PairTable.COLUMNS
+                           or change.get('op') not in StrategyRules.OPERATORS):
+                raise ValueError(f"Alert {name}: invalid change condition {change!r}")
+            if rule.get('enters') and rule['enters'] not in strategies.names:
+                raise ValueError(f"Alert {name}: unknown strategy {rule['enters']!r}")
+
+        self.conditions = StrategyRules({r['name']: r['when'] for r in definitions if 'when' in r})
+        self.change_fields = sorted({r['change']['field'] for r in definitions if 'change' in r})
+        self.entering = sorted({r['enters'] for r in definitions if 'enters' in r})
+        # address -> (change field values, strategies matched, last seen)
+        self.previous: Dict[str, tuple] = {}
+        self.last_fired: Dict[tuple, float] = {}
+        self.primed = False
+        self._pruned = 0.0
+
+    @classmethod
+    def from_file(cls, path: str, strategies: StrategyRules) -> tuple:
+        """Load `{"cooldown", "alerts": [...], "sinks": [...]}`, returning (engine, sink specs)"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        engine = cls(data.get("alerts", []), strategies, cooldown=data.get("cooldown", 300.0))
+        return engine, data.get("sinks", [])
+
+    def evaluate(self, pairs: List[Pair], now: Optional[float] = None) -> List[Dict]:
+        """Alerts fired by these pair updates; pairs not passed keep their previous state
+
+        On the first call `change` and `enters` rules only record state, so a fresh
+        engine does not report every pair as newly entering.
+        """
+        now = time.time() if now is None else now
+        if not pairs:
+            return []
+        count = len(pairs)
+        table = PairTable(pairs)
+        addresses = [pair.pair_address for pair in pairs]
+        previous = [self.previous.get(address) for address in addresses]
+        known = np.fromiter((state is not None for state in previous), dtype=bool, count=count)
+
+        conditions = self.conditions.evaluate(table) if self.conditions.names else {}
+        members = self.strategies.evaluate(table, self.entering) if self.entering else {}
+        changes = {}
+        for pos, field in enumerate(self.change_fields):
+            before = np.fromiter((state[0][pos] if state else np.nan for state in previous),
+                                 dtype=np.float64, count=count)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                changes[field] = (table[field] - before) / np.abs(before) * 100
+
+        alerts = []
+        for rule in self.definitions:
+            # Rules comparing against the previous cycle wait until there is one
+            if not self.primed and ('change' in rule or 'enters' in rule):
+                continue
+            name = rule['name']
+            mask = np.ones(count, dtype=bool)
+            if 'when' in rule:
+                mask &= conditions[name]
+            if 'change' in rule:
+                change = rule['change']
+                mask &= StrategyRules.OPERATORS[change['op']](changes[change['field']], float(change['value']))
+            if 'enters' in rule:
+                strategy = rule['enters']
+                was_member = np.fromiter((bool(state) and strategy in state[1] for state in previous),
+                                         dtype=bool, count=count)
+                mask &= members[strategy] & ~was_member
+            cooldown = rule.get('cooldown', self.cooldown)
+            for idx in np.flatnonzero(mask):
+                key = (name, addresses[idx])
+                if now - self.last_fired.get(key, -math.inf) < cooldown:
+                    continue
+                self.last_fired[key] = now
+                alerts.append(self._alert(rule, pairs[idx], now, known[idx], changes, idx))
+
+        # Carry this cycle's values forward
+        change_columns = [table[field] for field in self.change_fields]
+        for idx, address in enumerate(addresses):
+            matched = frozenset(s for s in self.entering if members[s][idx])
+            self.previous[address] = (tuple(float(col[idx]) for col in change_columns), matched, now)
+        self.primed = True
+        if now - self._pruned > 60:
+            self.prune(now)
+        return alerts
+
+    @staticmethod
+    def _alert(rule: Dict, pair: Pair, now: float, known: bool, changes: Dict, idx: int) -> Dict:
+        alert = {
+            'rule': rule['name'],
+            'timestamp': now,
+            'pair_address': pair.pair_address,
+            'contract': pair.token_address,
+            'name': pair.name,
+            'symbol': pair.symbol,
+            'price_usd': pair.price_usd,
+            'liquidity': pair.liquidity,
+            'volume_24h': pair.volume_24h,
+            'price_change_5m': pair.price_change_5m,
+            'price_change_1h': pair.price_change_1h,
+            'url': pair.url,
+            'new_pair': not known
+        }
+        if 'change' in rule:
+            alert['change_pct'] = float(changes[rule['change']['field']][idx])
+        if 'enters' in rule:
+            alert['strategy'] = rule['enters']
+        return alert
+
+    def prune(self, now: Optional[float] = None):
+        """Forget pairs not seen within state_ttl and cooldowns that have expired"""
+        now = time.time() if now is None else now
+        self._pruned = now
+        self.previous = {a: s for a, s in self.previous.items() if now - s[2] <= self.state_ttl}
+        longest = max([self.cooldown] + [r.get('cooldown', 0) for r in self.definitions])
+        self.last_fired = {k: t for k, t in self.last_fired.items() if now - t < longest}
+
+    def export_state(self) -> tuple[Dict, Dict[str, np.ndarray]]:
+        """Previous values, memberships and cooldowns for a state snapshot"""
+        addresses = list(self.previous)
+        states = [self.previous[a] for a in addresses]
+        rules = sorted({rule for rule, _ in self.last_fired})
+        rule_ids = {rule: idx for idx, rule in enumerate(rules)}
+        fired = list(self.last_fired.items())
+        arrays = {
+            'addresses': _pack_strings(addresses),
+            'values': np.array([values for values, _, _ in states], dtype=np.float64)
+            .reshape(len(states), len(self.change_fields)),
+            'members': np.array([[s in matched for s in self.entering] for _, matched, _ in states], dtype=bool)
+            .reshape(len(states), len(self.entering)),
+            'seen_at': np.array([seen_at for _, _, seen_at in states], dtype=np.float64),
+            'fired_rules': np.array([rule_ids[rule] for (rule, _), _ in fired], dtype=np.int64),
+            'fired_addresses': _pack_strings([address for (_, address), _ in fired]),
+            'fired_at': np.array([at for _, at in fired], dtype=np.float64)
+        }
+        header = {
+            'primed': self.primed,
+            'change_fields': self.change_fields,
+            'entering': self.entering,
+            'rules': rules
+        }
+        return header, arrays
+
+    def restore_state(self, header: Dict, arrays: Dict[str, np.ndarray]) -> int:
+        """Reload exported state, matching fields and strategies by name if the rules have changed"""
+        addresses = _unpack_strings(arrays['addresses'])
+        values, members = arrays['values'], arrays['members']
+        columns = [header['change_fields'].index(f) if f in header['change_fields'] else None
+                   for f in self.change_fields]
+        strategies = [(s, header['entering'].index(s)) for s in self.entering if s in header['entering']]
+        self.previous = {
+            address: (
+                tuple(float(values[row, col]) if col is not None else math.nan for col in columns),
+                frozenset(s for s, col in strategies if members[row, col]),
+                seen_at
+            )
+            for row, (address, seen_at) in enumerate(zip(addresses, arrays['seen_at'].tolist()))
+        }
+        rules = header['rules']
+        self.last_fired = {
+            (rules[rule], address): at
+            for rule, address, at in zip(arrays['fired_rules'].tolist(),
+                                         _unpack_strings(arrays['fired_addresses']),
+                                         arrays['fired_at'].tolist())
+        }
+        self.primed = header['primed'] and bool(self.previous)
+        self.prune()
+        return len(self.previous)
+
+class FileAlertSink:
+    """Appends alerts to a JSON Lines file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def send(self, alerts: List[Dict]) -> int:
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(alert) + "\n" for alert in alerts))
+        return len(alerts)
+
+class WebhookAlertSink:
+    """POSTs each alert as JSON to a webhook URL"""
+
+    def __init__(self, url: str, timeout: float = 5.0, headers: Optional[Dict] = None):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update(headers or {})
+
+    def send(self, alerts: List[Dict]) -> int:
+        delivered = 0
+        for alert in alerts:
+            try:
+                response = self.session.post(self.url, json=alert, timeout=self.timeout)
+                response.raise_for_status()
+                delivered += 1
+            except requests.RequestException as e:
+                print(f"Error delivering alert {alert['rule']} to {self.url}: {e}")
+        return delivered
+
+class ConsoleAlertSink:
+    """Prints a one-line summary per alert"""
+
+    def send(self, alerts: List[Dict]) -> int:
+        for alert in alerts:
+            print(f"🚨 [{alert['rule']}] {alert['name']} (${alert['symbol']}) "
+                  f"{format_number(alert['price_usd'])} | liq {format_number(alert['liquidity'])} "
+                  f"| 5m {alert['price_change_5m']:.1f}% | {alert['url']}")
+        return len(alerts)
+
+ALERT_SINKS = {
+    'file': FileAlertSink,
+    'webhook': WebhookAlertSink,
+    'console': ConsoleAlertSink
+}
+
+class AlertDispatcher:
+    """Delivers alerts to sinks from a background thread
+
+    submit() never blocks: when the bounded queue is full (a slow or dead sink)
+    new alerts are counted in `dropped` instead of stalling the scan loop.
+    """
 
-        for meta, data in self.current_metas.items():
-            if any(kw in name or kw in symbol for kw in data["keywords"]):
-                data["volume_24h"] += volume_24h
-                data["recent_pairs"].append({
-                    "name": name,
-                    "symbol": symbol,
-                    "volume": volume_24h,
-                    "timestamp": datetime.now()
-                })
-
-                # Clean old data
-                data["recent_pairs"] = [
-                    p for p in data["recent_pairs"]
-                    if datetime.now() - p["timestamp"] < self.momentum_window
-                ]
+    def __init__(self, sinks: List, max_pending: int = 1000, batch_size: int = 100):
+        self.sinks = sinks
+        self.batch_size = batch_size
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._worker = threading.Thread(target=self._deliver_loop, name="alert-dispatch", daemon=True)
+        self._worker.start()
 
-    def get_hot_metas(self) -> List[tuple[Meta, float]]:
-        """Get currently trending metas sorted by momentum"""
-        momentum_scores = {}
-        for meta, data in self.current_metas.items():
-            recent_volume = sum(p["volume"] for p in data["recent_pairs"])
-            pair_count = len(data["recent_pairs"])
-            momentum = (recent_volume * 0.7 + (pair_count * 100000) * 0.3) * (data["score"] / 100)
-            momentum_scores[meta] = momentum
+    @classmethod
+    def from_specs(cls, specs: List[Dict], **kwargs) -> "AlertDispatcher":
+        """Build sinks from `{"type": "file" | "webhook" | "console", ...options}` specs"""
+        sinks = []
+        for spec in specs or [{'type': 'console'}]:
+            options = dict(spec)
+            kind = options.pop('type', None)
+            if kind not in ALERT_SINKS:
+                raise ValueError(f"Unknown alert sink {kind!r}, expected one of {sorted(ALERT_SINKS)}")
+            sinks.append(ALERT_SINKS[kind](**options))
+        return cls(sinks, **kwargs)
 
-        return sorted(momentum_scores.items(), key=lambda x: x[1], reverse=True)
-    
-class WhaleKOLTracker:
-    def __init__(self):
-            self.whale_wallets = {
-                "HN4AkYD4N6f4KFYkxFemY6bz2B3qubGtK1r6H3ymYAFS": {
-                    "name": "Known Whale 1",
-                    "type": "whale",
-                    "tags": ["AI trader", "Early adopter"],
-                    "success_rate": 0.85,
-                    "last_trades": [],
-                    "total_volume": 0
-                }
-            }
-            
-            self.kol_wallets = {
-                "2MxyVwqWGbsB6RhQvfNQrfEKyDr9fLt2Z5FxQs5vRECF": {
-                    "name": "KOL 1",
-                    "type": "kol",
-                    "tags": ["Meme specialist", "High influence"],
-                    "followers": 50000,
-                    "success_rate": 0.92,
-                    "last_calls": []
-                }
-            }
-            
-    def add_whale_wallet(self, address: str, name: str, tags: List[str] = None) -> bool:
-            """Add a new whale wallet to track"""
+    def submit(self, alerts: List[Dict]) -> int:
+        """Queue alerts for delivery, returning how many were accepted"""
+        accepted = 0
+        for alert in alerts:
             try:
-                self.whale_wallets[address] = {
-                    "name": name,
-                    "type": "whale",
-                    "tags": tags or [],
-                    "success_rate": 0.0,
-                    "last_trades": [],
-                    "total_volume": 0,
-                    "added_date": datetime.now()
-                }
-                print(f"Added whale wallet: {name} ({address})")
-                return True
-            except Exception as e:
-                print(f"Error adding whale wallet: {e}")
-                return False
-                
-    def add_kol_wallet(self, address: str, name: str, followers: int, tags: List[str] = None) -> bool:
-        """Add a new KOL wallet to track"""
-        try:
-            self.kol_wallets[address] = {
-                "name": name,
-                "type": "kol",
-                "tags": tags or [],
-                "followers": followers,
-                "success_rate": 0.0,
-                "last_calls": [],
-                "added_date": datetime.now()
-            }
-            print(f"Added KOL wallet: {name} ({address})")
-            return True
-        except Exception as e:
-            print(f"Error adding KOL wallet: {e}")
-            return False
+                self._queue.put_nowait(alert)
+                accepted += 1
+            except queue.Full:
+                self.dropped += 1
+        return accepted
 
-    def analyze_wallet_interest(self, pair: Dict) -> Dict:
-            """Analyze whale and KOL interest in a token"""
-            try:
-                liquidity = float(pair.get('liquidity', {}).get('usd', 0) or 0)
-                volume_24h = float(pair.get('volume', {}).get('h24', 0) or 0)
-                contract = pair.get('baseToken', {}).get('address', '')
-                
-                # Check for whale activity
-                whale_score = 0
-                active_whales = []
-                for address, whale in self.whale_wallets.items():
-                    if self._check_wallet_activity(address, contract):
-                        whale_score += whale['success_rate'] * 20
-                        active_whales.append(whale['name'])
-                
-                # Check for KOL interest
-                kol_score = 0
-                active_kols = []
-                for address, kol in self.kol_wallets.items():
-                    if self._check_wallet_activity(address, contract):
-                        influence_factor = min(kol['followers'] / 10000, 10)
-                        kol_score += kol['success_rate'] * influence_factor * 10
-                        active_kols.append(kol['name'])
-                
-                # Combined analysis
-                combined_score = (whale_score * 0.6 + kol_score * 0.4)
-                risk_level = self._assess_risk_level(combined_score, len(active_whales), len(active_kols))
-                
-                return {
-                    'score': min(100, combined_score),
-                    'whale_metrics': {
-                        'active_whales': active_whales,
-                        'whale_score': whale_score
-                    },
-                    'kol_metrics': {
-                        'active_kols': active_kols,
-                        'kol_score': kol_score
-                    },
-                    'risk_level': risk_level
-                }
-                
-            except Exception as e:
-                print(f"Error in wallet analysis: {e}")
-                return {
-
-                    'score': 0,
-                    'whale_metrics': {'active_whales': [], 'whale_score': 0},
-                    'kol_metrics': {'active_kols': [], 'kol_score': 0},
-                    'risk_level': 'high'
-                }
-    
-    def _check_wallet_activity(self, wallet_address: str, token_address: str) -> bool:
-        """Check if wallet has recent activity with token"""
-        # This would need to be implemented with actual blockchain data
-        return False
+    def _deliver_loop(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            items = [item]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = [alert for alert in items if alert is not None]
+            stopping = len(batch) < len(items)
 
-    def _assess_risk_level(self, score: float, whale_count: int, kol_count: int) -> str:
-        """Assess risk level based on wallet activity"""
-        if score >= 80 and whale_count >= 2:
-            return "low"
-        elif score >= 60 and (whale_count >= 1 or kol_count >= 2):
-            return "medium"
-        elif score < 30 or (whale_count == 0 and kol_count == 0):
-            return "high"
-        else:
-            return "medium"
+            for sink in self.sinks:
+                try:
+                    delivered = sink.send(batch) if batch else 0
+                    self.failed += len(batch) - delivered
+                except Exception as e:
+                    self.failed += len(batch)
+                    print(f"Error in alert sink {type(sink).__name__}: {e}")
+            self.sent += len(batch)
+            for _ in items:
+                self._queue.task_done()
 
-    def get_wallet_stats(self) -> Dict:
-        """Get current wallet statistics"""
-        return {
-            'whales': {
-                'count': len(self.whale_wallets),
-                'avg_success_rate': sum(w['success_rate'] for w in self.whale_wallets.values()) / len(self.whale_wallets) if self.whale_wallets else 0
-            },
-            'kols': {
-                'count': len(self.kol_wallets),
-                'total_followers': sum(k['followers'] for k in self.kol_wallets.values()),
-                'avg_success_rate': sum(k['success_rate'] for k in self.kol_wallets.values()) / len(self.kol_wallets) if self.kol_wallets else 0
-            }
-        }   
-class JupiterTrader:
+    def flush(self):
+        """Block until every queued alert has been handed to the sinks"""
+        self._queue.join()
+
+    def close(self, timeout: float = 5.0):
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._worker.join(timeout=timeout)
+
+class WatchState:
+    """State carried between watch-mode cycles"""
 
     def __init__(self):
-        self.referral_key = "6svoeECRFJvcazjUMbF4axe6Qp55MNm8FB8CkVXjYUqB"
-        self.fees_bps = "50"
-        self.base_url = "https://jup.ag"
+        self.fingerprints: Dict[str, int] = {}
+        self.membership: Dict[str, set] = {}
+        self.formatted: Dict[str, Dict] = {}
+        self.pairs: Dict[str, Pair] = {}
+        self.shown: Dict[str, set] = {}
+        self.query_pairs: Dict[str, List[Pair]] = {}
+        self.vanished: List[str] = []
+        self.cycles = 0
 
-    def get_trade_link(self, token_address: str, token_symbol: str) -> str:
-        """Generate Jupiter trading link with referral"""
-        return (
-            f"{self.base_url}/swap/{token_symbol}-SOL"
-            f"?referrer={self.referral_key}&feeBps={self.fees_bps}"
-        )
+    @staticmethod
+    def fingerprint(pair: Pair) -> int:
+        """Stable 64-bit hash of the fields filtering and formatting depend on"""
+        digest = hashlib.blake2b(repr(pair.to_record()).encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
 
-    def get_quick_links(self, token_data: Dict) -> Dict[str, str]:
-        """Generate all relevant trading and info links"""
-        token_address = token_data.get('contract', '')
-        token_symbol = token_data.get('token_symbol', '')
+    def forget(self, address: str):
+        """Drop a vanished pair; its record is kept until the next cycle so its left row still renders"""
+        self.fingerprints.pop(address, None)
+        self.formatted.pop(address, None)
+        self.vanished.append(address)
 
-        return {
-            'jupiter': self.get_trade_link(token_address, token_symbol),
-            'dexscreener': token_data.get('url', ''),
-            'solscan': f"https://solscan.io/token/{token_address}"
+    def release_vanished(self):
+        for address in self.vanished:
+            self.pairs.pop(address, None)
+        self.vanished = []
+
+    def export_state(self) -> tuple[Dict, Dict[str, np.ndarray]]:
+        """Seen-pair fingerprints and strategy membership for a state snapshot"""
+        addresses = list(self.fingerprints)
+        rows = {address: row for row, address in enumerate(addresses)}
+        members = {address for names in self.membership.values() for address in names}
+        arrays = {
+            'addresses': _pack_strings(addresses),
+            'fingerprints': np.fromiter(self.fingerprints.values(), dtype=np.uint64, count=len(addresses)),
+            'pairs': _pack_strings([_encode_pairs([self.pairs[a] for a in members if a in self.pairs])])
         }
+        strategies = list(self.membership)
+        for idx, name in enumerate(strategies):
+            arrays[f"member{idx}"] = np.array([rows[a] for a in self.membership[name] if a in rows], dtype=np.int64)
+            arrays[f"shown{idx}"] = np.array([rows[a] for a in self.shown.get(name, ()) if a in rows],
+                                             dtype=np.int64)
+        return {'strategies': strategies}, arrays
+
+    def restore_state(self, header: Dict, arrays: Dict[str, np.ndarray]) -> int:
+        """Reload exported fingerprints, returning how many pairs are known again"""
+        addresses = _unpack_strings(arrays['addresses'])
+        self.fingerprints = dict(zip(addresses, arrays['fingerprints'].tolist()))
+        self.membership = {
+            name: {addresses[row] for row in arrays[f"member{idx}"].tolist()}
+            for idx, name in enumerate(header['strategies'])
+        }
+        self.shown = {
+            name: {addresses[row] for row in arrays.get(f"shown{idx}", arrays[f"member{idx}"]).tolist()}
+            for idx, name in enumerate(header['strategies'])
+        }
+        self.pairs = {pair.pair_address: pair for pair in _decode_pairs(_unpack_strings(arrays['pairs'])[0])}
+        self.formatted = {}
+        return len(self.fingerprints)
+
+class StateCheckpoint:
+    """Binary snapshot of warm scanner state: written atomically, memory-mapped on load
+
+    Layout: magic, little-endian header length, JSON header, then 64-byte aligned raw arrays
+    whose dtype, shape and offset the header records.
+    """
+
+    MAGIC = b"MCSTATE1"
+    ALIGN = 64
+
+    def __init__(self, path: str, interval: float = 60.0):
+        self.path = path
+        self.interval = interval
+        self.saved_at = 0.0
+        self._last_save = time.monotonic()
+
+    @classmethod
+    def _aligned(cls, offset: int) -> int:
+        return -(-offset // cls.ALIGN) * cls.ALIGN
+
+    def due(self) -> bool:
+        """Whether a periodic checkpoint is due"""
+        return time.monotonic() - self._last_save >= self.interval
+
+    def save(self, components: Dict[str, tuple]) -> int:
+        """Write {component: (header, arrays)} to a temp file and swap it in, returning the size"""
+        headers, sections, blobs = {}, {}, []
+        offset = 0
+        for component, (header, arrays) in components.items():
+            headers[component] = header
+            for name, arr in arrays.items():
+                arr = np.ascontiguousarray(arr)
+                offset = self._aligned(offset)
+                sections[f"{component}.{name}"] = [arr.dtype.str, list(arr.shape), offset]
+                blobs.append((offset, arr))
+                offset += arr.nbytes
+
+        saved_at = time.time()
+        meta = json.dumps({'saved_at': saved_at, 'components': headers, 'sections': sections}).encode()
+        data_start = self._aligned(len(self.MAGIC) + 8 + len(meta))
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(len(meta).to_bytes(8, "little"))
+            f.write(meta)
+            for offset, arr in blobs:
+                f.write(b"\0" * (data_start + offset - f.tell()))
+                f.write(arr.tobytes())
+            size = f.tell()
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.saved_at = saved_at
+        self._last_save = time.monotonic()
+        return size
+
+    def load(self) -> Optional[Dict[str, tuple]]:
+        """Map the snapshot copy-on-write and return {component: (header, arrays)}, or None"""
+        try:
+            with open(self.path, "rb") as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error opening scanner state at {self.path}: {e}")
+            return None
+
+        try:
+            if mapped[:len(self.MAGIC)] != self.MAGIC:
+                raise ValueError("not a scanner state file")
+            start = len(self.MAGIC) + 8
+            length = int.from_bytes(mapped[len(self.MAGIC):start], "little")
+            meta = json.loads(mapped[start:start + length])
+            data_start = self._aligned(start + length)
+            components = {name: (header, {}) for name, header in meta['components'].items()}
+            for key, (dtype, shape, offset) in meta['sections'].items():
+                component, _, name = key.partition(".")
+                count = math.prod(shape)
+                arr = np.frombuffer(mapped, dtype=dtype, count=count, offset=data_start + offset) \
+                    if count else np.empty(shape, dtype=dtype)
+                components[component][1][name] = arr.reshape(shape)
+        except (ValueError, KeyError, TypeError) as e:
+            print(f"Error reading scanner state at {self.path}: {e}")
+            return None
+        self.saved_at = meta['saved_at']
+        return components
 
 class MemecoinScanner:
-    def __init__(self):
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+    BASE_SEARCH_TERMS = [
+        "solana meme",
+        "sol dog",
+        "sol cat",
+        "solana ai",
+        "solana new",
+        "raydium new"
+    ]
+
+    def __init__(self, max_concurrency: int = 8, timeout: float = 10.0,
+                 cache: Optional[ResponseCache] = None,
+                 rate_limiter: Optional[RateLimiter] = None,
+                 rules: Optional[StrategyRules] = None,
+                 snapshots: Optional[SnapshotStore] = None,
+                 transport: Optional[BaseAdapter] = None,
+                 metrics: Optional[Metrics] = None,
+                 max_retries: int = 4, backoff_base: float = 0.5, backoff_cap: float = 30.0):
         self.base_url = "https://api.dexscreener.com/latest/dex/search"
+        self.batch_urls = {
+            'token': "https://api.dexscreener.com/latest/dex/tokens",
+            'pair': "https://api.dexscreener.com/latest/dex/pairs/solana"
+        }
+        self.watchlist = Watchlist()
+        self.shards = None
+        self.alerts: Optional[AlertEngine] = None
+        self.alert_dispatcher: Optional[AlertDispatcher] = None
+        self.checkpoint: Optional[StateCheckpoint] = None
         self.meta_tracker = MetaTracker()
         self.wallet_tracker = WhaleKOLTracker()
         self.jupiter_trader = JupiterTrader()
-        
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = timeout
+        self.cache = cache if cache is not None else ResponseCache()
+        self.rules = rules if rules is not None else StrategyRules(DEFAULT_STRATEGY_RULES)
+        self.snapshots = snapshots
+        self.metrics = metrics if metrics is not None else Metrics(enabled=False)
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.session = self._build_session(self.max_concurrency, transport)
+
+    @staticmethod
+    def _build_session(pool_size: int, transport: Optional[BaseAdapter] = None) -> requests.Session:
+        """Create a keep-alive session sized for concurrent searches, or over an injected transport"""
+        session = requests.Session()
+        adapter = transport or HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def add_whale(self, address: str, name: str, tags: List[str] = None) -> bool:
         """Add a new whale wallet to track"""
         return self.wallet_tracker.add_whale_wallet(address, name, tags)
@@ -267,123 +2741,345 @@ class MemecoinScanner:
         """Add a new KOL wallet to track"""
         return self.wallet_tracker.add_kol_wallet(address, name, followers, tags)
 
-    def search_pairs(self, query: str = "solana") -> List[Dict]:
-        """Search pairs using DEXScreener API"""
+    def _retry_delay(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        """Seconds to wait before the next attempt: Retry-After if given, else jittered backoff"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(self.backoff_cap, max(0.0, float(retry_after)))
+            except ValueError:
+                try:
+                    when = parsedate_to_datetime(retry_after)
+                    delta = (when - datetime.now(timezone.utc)).total_seconds()
+                    return min(self.backoff_cap, max(0.0, delta))
+                except (TypeError, ValueError):
+                    pass
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _get(self, url: str, params: Dict = None, stream: bool = False,
+             label: Optional[str] = None, priority: int = 0) -> requests.Response:
+        """Rate-limited GET that retries 429/5xx and connection errors"""
+        label = label or (params or {}).get("q", "other")
+        response = None
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire(priority)
+            started = time.perf_counter()
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout, stream=stream)
+            except requests.RequestException as e:
+                self.metrics.inc("scanner_http_errors_total", kind=type(e).__name__)
+                if attempt == self.max_retries:
+                    raise
+                # Retries are counted, not printed: this runs on fetch threads
+                self.metrics.inc("scanner_http_retries_total", status=type(e).__name__)
+                time.sleep(self._retry_delay(attempt))
+                continue
+            self.metrics.observe("scanner_http_request_seconds", time.perf_counter() - started, query=label)
+            self.metrics.inc("scanner_http_responses_total", status=str(response.status_code))
+
+            if response.status_code not in self.RETRY_STATUSES:
+                if response.status_code == 200:
+                    self.rate_limiter.record_success()
+                return response
+
+            if attempt == self.max_retries:
+                break
+
+            response.close()
+            self.metrics.inc("scanner_http_retries_total", status=str(response.status_code))
+            delay = self._retry_delay(attempt, response)
+            if response.status_code == 429:
+                self.rate_limiter.penalize(delay)
+            else:
+                time.sleep(delay)
+
+        return response
+
+    def _fetch_pairs(self, query: str, priority: int = 0) -> tuple[Optional[List[Pair]], Optional[str]]:
+        """Fetch Solana pairs for a query without touching shared state; (None, error) on failure"""
+        cached = self.cache.get(query)
+        self.metrics.inc("scanner_cache_requests_total", result="miss" if cached is None else "hit")
+        if cached is not None:
+            return cached, None
+
         try:
             params = {"q": query}
-            response = requests.get(self.base_url, params=params)
+            streaming = ijson is not None
+            response = self._get(self.base_url, params=params, stream=streaming, priority=priority)
 
             if response.status_code != 200:
-                print(f"Error searching pairs: Status {response.status_code}")
-                print(f"Response: {response.text[:200]}")
-                return []
+                self.metrics.inc("scanner_fetch_errors_total", reason="status")
+                return None, f"Status {response.status_code}: {response.text[:200]}"
+
+            # Filter for Solana pairs while parsing, keeping only compact records
+            with self.metrics.timer("scanner_stage_seconds", stage="parse"):
+                if streaming:
+                    response.raw.decode_content = True
+                    with response:
+                        solana_pairs = parse_pairs(response.raw)
+                else:
+                    solana_pairs = parse_pairs(response.content)
+            self.cache.set(query, solana_pairs)
+            return solana_pairs, None
 
-            data = response.json()
-            pairs = data.get('pairs', [])
+        except Exception as e:
+            self.metrics.inc("scanner_fetch_errors_total", reason="exception")
+            return None, str(e)
 
-            # Filter for Solana pairs
-            solana_pairs = [p for p in pairs if p.get('chainId') == 'solana']
-            print(f"Found {len(solana_pairs)} Solana pairs for query: {query}")
+    def _fetch_batch(self, kind: str, addresses: List[str],
+                     priority: int = 0) -> tuple[Optional[List[Pair]], Optional[str]]:
+        """Fetch Solana pairs for up to Watchlist.MAX_BATCH addresses in one request; (None, error) on failure"""
+        try:
+            url = f"{self.batch_urls[kind]}/{','.join(addresses)}"
+            streaming = ijson is not None
+            response = self._get(url, stream=streaming, label=f"{kind}s", priority=priority)
 
-            # Update meta tracking
-            for pair in solana_pairs:
-                self.meta_tracker.update_meta(pair)
+            if response.status_code != 200:
+                self.metrics.inc("scanner_fetch_errors_total", reason="status")
+                return None, f"Status {response.status_code}: {response.text[:200]}"
 
-            return solana_pairs
+            with self.metrics.timer("scanner_stage_seconds", stage="parse"):
+                if streaming:
+                    response.raw.decode_content = True
+                    with response:
+                        return parse_pairs(response.raw), None
+                return parse_pairs(response.content), None
 
         except Exception as e:
-            print(f"Error in search_pairs: {e}")
+            self.metrics.inc("scanner_fetch_errors_total", reason="exception")
+            return None, str(e)
+
+    def _run_task(self, task: tuple, priority: int = 0) -> tuple[Optional[List[Pair]], Optional[str]]:
+        """Run one fetch task: ('search', query) or a watchlist batch (kind, addresses)"""
+        if task[0] == 'search':
+            return self._fetch_pairs(task[1], priority)
+        return self._fetch_batch(task[0], task[1], priority)
+
+    def _fetch_results(self, tasks: List[tuple], prefix: str, priorities: Optional[List[int]] = None):
+        """Yield (task, pairs, error) as fetches finish, from worker threads or shard processes
+
+        Tasks start in the given order; `priorities` (one per task) then decides
+        which waiting request the rate limiter lets through first.
+        """
+        priorities = priorities or [0] * len(tasks)
+        if self.shards is not None:
+            yield from self.shards.run(tasks, priorities)
+            return
+        workers = min(self.max_concurrency, len(tasks))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=prefix) as executor:
+            futures = {executor.submit(self._run_task, task, priority): task
+                       for task, priority in zip(tasks, priorities)}
+            for future in as_completed(futures):
+                yield (futures[future],) + future.result()
+
+    def watch_token(self, address: str, priority: int = 0, interval: Optional[float] = None) -> bool:
+        """Track a token's pairs directly instead of relying on search terms"""
+        return self.watchlist.add(address, 'token', priority, interval)
+
+    def watch_pair(self, address: str, priority: int = 0, interval: Optional[float] = None) -> bool:
+        """Track a single pair directly instead of relying on search terms"""
+        return self.watchlist.add(address, 'pair', priority, interval)
+
+    def load_watchlist(self, path: str) -> int:
+        """Load watched token/pair addresses from CSV, JSON or a plain list"""
+        added = self.watchlist.load_file(path)
+        print(f"Watching {added} addresses from {path}")
+        return added
+
+    def refresh_watchlist(self, on_pairs: Optional[Callable[[str, List[Pair]], None]] = None,
+                          max_requests: Optional[int] = None) -> List[Pair]:
+        """Refresh due watchlist addresses in batched requests, returning every watched pair"""
+        batches = self.watchlist.plan(max_requests=max_requests)
+        if not batches:
+            return list(self.watchlist.pairs.values())
+
+        with self.metrics.timer("scanner_stage_seconds", stage="watchlist"):
+            for (kind, addresses), pairs, error in self._fetch_results(batches, "dex-watch"):
+                if pairs is None:
+                    print(f"Error refreshing {len(addresses)} {kind} addresses: {error}")
+                    continue
+                self.metrics.inc("scanner_pairs_fetched_total", len(pairs))
+
+                # Shared state is only touched on the calling thread
+                for pair in pairs:
+                    self.meta_tracker.update_meta(pair)
+                self.watchlist.mark_refreshed(kind, addresses, pairs)
+                if on_pairs:
+                    on_pairs(f"{kind}s", pairs)
+
+        print(f"Refreshed {sum(len(a) for _, a in batches)} watched addresses in {len(batches)} requests")
+        return list(self.watchlist.pairs.values())
+
+    def search_pairs(self, query: str = "solana") -> List[Pair]:
+        """Search pairs using DEXScreener API"""
+        solana_pairs, error = self._fetch_pairs(query)
+        if solana_pairs is None:
+            print(f"Error searching pairs for {query}: {error}")
             return []
+        print(f"Found {len(solana_pairs)} Solana pairs for query: {query}")
 
-    def filter_pairs(self, pairs: List[Dict], strategy: ScanStrategy) -> List[Dict]:
-        """Filter pairs based on strategy criteria"""
-        filtered = []
+        # Update meta tracking
+        for pair in solana_pairs:
+            self.meta_tracker.update_meta(pair)
 
-        for pair in pairs:
-            try:
-                liquidity = float(pair.get('liquidity', {}).get('usd', 0) or 0)
-                volume_24h = float(pair.get('volume', {}).get('h24', 0) or 0)
-                fdv = float(pair.get('fdv', 0) or 0)
+        return solana_pairs
+
+    def search_many(self, queries: List[str],
+                    on_pairs: Optional[Callable[[str, List[Pair]], None]] = None,
+                    priorities: Dict[str, int] = None) -> List[Pair]:
+        """Run searches concurrently over the shared session, merging results as they arrive"""
+        all_pairs = []
+        if not queries:
+            return all_pairs
+
+        # Higher priority queries are submitted (and so started) first, and jump
+        # the rate limiter's queue once it starts throttling
+        priorities = priorities or {}
+        queries = sorted(queries, key=lambda q: priorities.get(q, 0), reverse=True)
 
-                # Skip pairs with invalid metrics
-                if liquidity == 0 or volume_24h == 0 or fdv == 0:
+        with self.metrics.timer("scanner_stage_seconds", stage="search"):
+            tasks = [('search', q) for q in queries]
+            ranks = [priorities.get(q, 0) for q in queries]
+            for (_, query), pairs, error in self._fetch_results(tasks, "dex-search", ranks):
+                # Fetch threads only report errors; they are printed here, one line each
+                if pairs is None:
+                    print(f"Error searching pairs for {query}: {error}")
                     continue
+                print(f"Found {len(pairs)} Solana pairs for query: {query}")
+                self.metrics.inc("scanner_pairs_fetched_total", len(pairs))
 
-                meets_criteria = False
+                # Meta tracking stays on the calling thread
+                with self.metrics.timer("scanner_stage_seconds", stage="meta"):
+                    for pair in pairs:
+                        self.meta_tracker.update_meta(pair)
+                all_pairs.extend(pairs)
 
-                if strategy == ScanStrategy.MICRO_CAP:
-                    meets_criteria = (
-                        liquidity >= 10000 and
-                        volume_24h >= 30000 and
-                        50000 <= fdv <= 20000000
-                    )
+                if on_pairs:
+                    on_pairs(query, pairs)
 
-                elif strategy == ScanStrategy.SMALL_CAP:
-                    meets_criteria = (
-                        liquidity >= 10000 and
-                        volume_24h >= 30000 and
-                        100000 <= fdv <= 20000000
-                    )
+        return all_pairs
 
-                elif strategy == ScanStrategy.MID_CAP:
-                    meets_criteria = (
-                        liquidity >= 10000 and
-                        volume_24h >= 3000000 and
-                        1000000 <= fdv <= 3000000
-                    )
+    def build_search_terms(self) -> tuple[List[str], Dict[str, int]]:
+        """Search terms combining current metas and basic searches, with priorities"""
+        search_terms = list(self.BASE_SEARCH_TERMS)
 
-                elif strategy == ScanStrategy.DIP_HUNTING:
-                    price_change_24h = float(pair.get('priceChange', {}).get('h24', 0) or 0)
-                    meets_criteria = (
-                        liquidity >= 10000 and
-                        volume_24h >= 300000 and
-                        100000 <= fdv <= 10000000 and
-                        price_change_24h < -10
-                    )
+        # Add terms based on hot metas, hottest first
+        priorities = {}
+        for rank, (meta, _) in enumerate(self.meta_tracker.get_hot_metas()[:3]):
+            term = f"solana {meta.value.lower()}"
+            search_terms.append(term)
+            priorities[term] = 3 - rank
 
-                if meets_criteria:
-                    # Add whale/KOL analysis
-                    wallet_analysis = self.wallet_tracker.analyze_wallet_interest(pair)
-                    pair['wallet_analysis'] = wallet_analysis
-                    filtered.append(pair)
+        return search_terms, priorities
 
-            except Exception as e:
-                continue
+    def record_snapshots(self, pairs: List[Pair]):
+        """Hand a cycle's pairs to the history store, if one is configured"""
+        if self.snapshots is not None:
+            with self.metrics.timer("scanner_stage_seconds", stage="snapshot"):
+                self.snapshots.record(pairs)
 
-        # Sort by volume
-        return sorted(
-            filtered,
-            key=lambda x: float(x.get('volume', {}).get('h24', 0) or 0),
-            reverse=True
-        )
+    def get_history(self, pair_addresses: List[str], since: Optional[timedelta] = None) -> Dict:
+        """Recorded time series per pair address"""
+        if self.snapshots is None:
+            return {}
+        start = time.time() - since.total_seconds() if since else None
+        return self.snapshots.history(pair_addresses, start)
+
+    @staticmethod
+    def dedupe_pairs(pairs: List[Pair]) -> Dict[str, Pair]:
+        """Unique pairs keyed by pair address, last occurrence wins"""
+        return {
+            pair.pair_address: pair
+            for pair in pairs
+            if pair.pair_address
+        }
+
+    @staticmethod
+    def _strategy_name(strategy) -> str:
+        return strategy.value if isinstance(strategy, ScanStrategy) else strategy
+
+    def _match(self, pairs: List[Pair], names: List[str]) -> tuple:
+        """Evaluate strategy masks and attach wallet analysis to every matched pair"""
+        with self.metrics.timer("scanner_stage_seconds", stage="filter"):
+            table = PairTable(pairs)
+            masks = self.rules.evaluate(table, names)
+            matched = np.logical_or.reduce([masks[name] for name in names]) if names \
+                else np.zeros(len(pairs), dtype=bool)
+
+        # Whale/KOL analysis once per pair, however many strategies it matches
+        with self.metrics.timer("scanner_stage_seconds", stage="analyze"):
+            analyzed = np.flatnonzero(matched)
+            analyses = self.wallet_tracker.analyze_batch([pairs[idx] for idx in analyzed])
+            for idx, analysis in zip(analyzed, analyses):
+                pairs[idx].wallet_analysis = analysis
+
+        return table, masks
+
+    def filter_all(self, pairs: List[Pair], strategies: Optional[List] = None,
+                   limit: Optional[int] = None, key='volume') -> Dict[str, List[Pair]]:
+        """Filter pairs for several strategies in one vectorized pass, keyed by strategy name
+
+        Matches are ranked by `key` (see RANKING_KEYS); `limit` keeps only the top
+        rows of each strategy.
+        """
+        names = [self._strategy_name(s) for s in strategies] if strategies else self.rules.names
+        table, masks = self._match(pairs, names)
+        scores = ranking_key(key)(table, pairs)
+        return {
+            name: [pairs[idx] for idx in table.rank(masks[name], scores, limit)]
+            for name in names
+        }
+
+    def filter_pairs(self, pairs: List[Pair], strategy, limit: Optional[int] = None,
+                     key='volume') -> List[Pair]:
+        """Filter pairs based on strategy criteria"""
+        return self.filter_all(pairs, [strategy], limit, key)[self._strategy_name(strategy)]
 
-    def format_pair_info(self, pair: Dict) -> Dict:
+    def new_leaderboards(self, k: int = 20, key='volume', strategies: Optional[List] = None) -> Leaderboards:
+        """Empty per-strategy top-K leaderboards for this scanner's rules"""
+        names = [self._strategy_name(s) for s in strategies] if strategies else self.rules.names
+        return Leaderboards(names, k, key)
+
+    def rank_pairs(self, boards: Leaderboards, pairs: List[Pair]) -> List[str]:
+        """Offer one batch of fetched pairs to the leaderboards, returning the strategies that changed"""
+        if not pairs:
+            return []
+        table, masks = self._match(pairs, boards.names)
+        with self.metrics.timer("scanner_stage_seconds", stage="rank"):
+            return boards.offer(table, pairs, masks)
+
+    def format_pair_info(self, pair: Pair) -> Dict:
         """Format pair information for display"""
         try:
+            numbers = (pair.price_usd, pair.price_change_5m, pair.price_change_1h, pair.price_change_6h,
+                       pair.price_change_24h, pair.liquidity, pair.volume_24h, pair.fdv)
+            if any(math.isnan(n) for n in numbers):
+                raise ValueError(f"unparseable numbers for pair {pair.pair_address}")
+
             # Basic info
             formatted_info = {
-                'token_name': pair.get('baseToken', {}).get('name', 'Unknown'),
-                'token_symbol': pair.get('baseToken', {}).get('symbol', 'Unknown'),
-                'price_usd': float(pair.get('priceUsd', 0) or 0),
+                'token_name': pair.name or 'Unknown',
+                'token_symbol': pair.symbol or 'Unknown',
+                'price_usd': pair.price_usd,
                 'price_change': {
-                    '5m': float(pair.get('priceChange', {}).get('m5', 0) or 0),
-                    '1h': float(pair.get('priceChange', {}).get('h1', 0) or 0),
-                    '6h': float(pair.get('priceChange', {}).get('h6', 0) or 0),
-                    '24h': float(pair.get('priceChange', {}).get('h24', 0) or 0)
+                    '5m': pair.price_change_5m,
+                    '1h': pair.price_change_1h,
+                    '6h': pair.price_change_6h,
+                    '24h': pair.price_change_24h
                 },
-                'liquidity': float(pair.get('liquidity', {}).get('usd', 0) or 0),
+                'liquidity': pair.liquidity,
                 'volume': {
-                    '24h': float(pair.get('volume', {}).get('h24', 0) or 0)
+                    '24h': pair.volume_24h
                 },
-                'fdv': float(pair.get('fdv', 0) or 0),
-                'dex': pair.get('dexId', 'Unknown'),
-                'pair_address': pair.get('pairAddress', 'Unknown'),
-                'contract': pair.get('baseToken', {}).get('address', 'Unknown'),
-                'url': pair.get('url', '')
+                'fdv': pair.fdv,
+                'dex': pair.dex_id or 'Unknown',
+                'pair_address': pair.pair_address or 'Unknown',
+                'contract': pair.token_address or 'Unknown',
+                'url': pair.url
             }
 
             # Add whale/KOL analysis if available
-            wallet_analysis = pair.get('wallet_analysis', {})
+            wallet_analysis = pair.wallet_analysis
             if wallet_analysis:
                 formatted_info['wallet_analysis'] = wallet_analysis
 
@@ -396,10 +3092,346 @@ class MemecoinScanner:
             print(f"Error formatting pair info: {e}")
             return {}
 
+    def import_wallets(self, path: str) -> int:
+        """Bulk-load tracked wallets from CSV, JSON or Parquet"""
+        return self.wallet_tracker.import_wallets(path)
+
+    def load_wallet_activity(self, path: str) -> int:
+        """Load whale/KOL on-chain activity from a JSONL or CSV export"""
+        return self.wallet_tracker.load_activity(path)
+
+    def _watch_info(self, state: WatchState, address: str) -> Dict:
+        """Formatted info for a watched pair, formatting it on first use"""
+        info = state.formatted.get(address)
+        if info is None:
+            pair = state.pairs.get(address)
+            if pair is None:
+                return {'pair_address': address}
+            info = state.formatted[address] = self.format_pair_info(pair)
+        return info
+
+    def _rank_members(self, state: WatchState, members: set, limit: int, key='volume') -> List[str]:
+        """Top `limit` member addresses of one strategy by ranking key"""
+        addresses = sorted(a for a in members if a in state.pairs)
+        if not addresses:
+            return []
+        pairs = [state.pairs[a] for a in addresses]
+        table = PairTable(pairs)
+        order = table.rank(np.ones(len(pairs), dtype=bool), ranking_key(key)(table, pairs), limit)
+        return [addresses[idx] for idx in order]
+
+    def watch_cycle(self, state: WatchState, limit: Optional[int] = None,
+                    key='volume') -> Dict[str, Dict[str, List]]:
+        """Run one incremental cycle, returning per-strategy entered/changed/left deltas
+
+        With a limit only each strategy's top members by `key` are shown, and
+        deltas are relative to what was shown the cycle before.
+        """
+        started = time.perf_counter()
+        state.release_vanished()
+        search_terms, priorities = self.build_search_terms()
+        fetched = {}
+        all_pairs = self.search_many(search_terms, on_pairs=fetched.__setitem__, priorities=priorities)
+
+        # A failed query keeps its last results rather than making every one of its pairs leave
+        failed = [query for query in search_terms if query not in fetched and query in state.query_pairs]
+        for query in failed:
+            all_pairs += state.query_pairs[query]
+            fetched[query] = state.query_pairs[query]
+        if failed:
+            print(f"Keeping last cycle's pairs for {len(failed)} failed queries")
+        state.query_pairs = fetched
+
+        if self.watchlist:
+            all_pairs += self.refresh_watchlist()
+        with self.metrics.timer("scanner_stage_seconds", stage="dedupe"):
+            unique_pairs = self.dedupe_pairs(all_pairs)
+        self.record_snapshots(list(unique_pairs.values()))
+
+        # Only new or changed pairs are re-filtered, re-analysed and re-formatted
+        changed = {}
+        for address, pair in unique_pairs.items():
+            fingerprint = WatchState.fingerprint(pair)
+            if state.fingerprints.get(address) != fingerprint:
+                state.fingerprints[address] = fingerprint
+                changed[address] = pair
+
+        self.check_alerts(list(changed.values()))
+        results = self.filter_all(list(changed.values()), key=key) if changed else {}
+
+        delta = {}
+        for name in self.rules.names:
+            members = state.membership.setdefault(name, set())
+            matched = [pair.pair_address for pair in results.get(name, [])]
+            matched_set = set(matched)
+            members.difference_update([
+                a for a in members
+                if a not in unique_pairs or (a in changed and a not in matched_set)
+            ])
+            members.update(matched)
+            for address in matched:
+                state.pairs[address] = changed[address]
+                state.formatted.pop(address, None)
+
+            shown = state.shown.get(name, set())
+            if limit is None:
+                ranked, visible = matched, set(members)
+            else:
+                ranked = self._rank_members(state, members, limit, key)
+                visible = set(ranked)
+            state.shown[name] = visible
+
+            entered = [a for a in ranked if a not in shown]
+            updated = [a for a in ranked if a in shown and a in changed]
+            left = [a for a in shown if a not in visible]
+            with self.metrics.timer("scanner_stage_seconds", stage="format"):
+                delta[name] = {
+                    'entered': [self._watch_info(state, a) for a in entered],
+                    'changed': [self._watch_info(state, a) for a in updated],
+                    'left': [self._watch_info(state, a) for a in left]
+                }
+
+        # Vanished pairs are forgotten only once their left rows have been built
+        for address in [a for a in state.fingerprints if a not in unique_pairs]:
+            state.forget(address)
+
+        state.cycles += 1
+        self.record_cycle(len(unique_pairs), started)
+        return delta
+
+    def watch(self, interval: float = 60.0, cycles: int = 0,
+              on_delta: Optional[Callable[[Dict], None]] = None,
+              state: Optional[WatchState] = None, limit: Optional[int] = None,
+              key='volume') -> WatchState:
+        """Scan repeatedly, keeping state between cycles; cycles=0 runs until interrupted"""
+        state = state if state is not None else WatchState()
+        while not cycles or state.cycles < cycles:
+            started = time.monotonic()
+            delta = self.watch_cycle(state, limit, key)
+            if on_delta:
+                on_delta(delta)
+            self.save_state(state, force=False)
+            if cycles and state.cycles >= cycles:
+                break
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        return state
+
+    def check_alerts(self, pairs: List[Pair]) -> List[Dict]:
+        """Evaluate alert rules on updated pairs and queue any that fire for delivery"""
+        if self.alerts is None:
+            return []
+        with self.metrics.timer("scanner_stage_seconds", stage="alerts"):
+            alerts = self.alerts.evaluate(pairs)
+        for alert in alerts:
+            self.metrics.inc("scanner_alerts_total", rule=alert['rule'])
+        if alerts and self.alert_dispatcher is not None:
+            self.alert_dispatcher.submit(alerts)
+            self.metrics.set("scanner_alerts_dropped", self.alert_dispatcher.dropped)
+        return alerts
+
+    def export_state(self, state: Optional[WatchState] = None) -> Dict[str, tuple]:
+        """Warm state worth carrying across restarts, keyed by component"""
+        components = {
+            'meta': self.meta_tracker.export_state(),
+            'wallets': self.wallet_tracker.registry.export_state(),
+            'cache': self.cache.export_state()
+        }
+        if state is not None:
+            components['watch'] = state.export_state()
+        if self.alerts is not None:
+            components['alerts'] = self.alerts.export_state()
+        return components
+
+    def save_state(self, state: Optional[WatchState] = None, force: bool = True) -> bool:
+        """Checkpoint warm state, or only when the checkpoint interval has passed if not forced"""
+        if self.checkpoint is None or not (force or self.checkpoint.due()):
+            return False
+        try:
+            with self.metrics.timer("scanner_stage_seconds", stage="checkpoint"):
+                size = self.checkpoint.save(self.export_state(state))
+        except OSError as e:
+            print(f"Error writing scanner state: {e}")
+            return False
+        self.metrics.set("scanner_state_bytes", size)
+        return True
+
+    def load_state(self, state: Optional[WatchState] = None) -> Dict[str, int]:
+        """Restore the last checkpoint, returning how many items each component got back"""
+        components = self.checkpoint.load() if self.checkpoint is not None else None
+        if not components:
+            return {}
+        targets = {
+            'meta': self.meta_tracker,
+            'wallets': self.wallet_tracker.registry,
+            'cache': self.cache,
+            'watch': state,
+            'alerts': self.alerts
+        }
+        restored = {}
+        for name, (header, arrays) in components.items():
+            target = targets.get(name)
+            if target is None:
+                continue
+            try:
+                restored[name] = target.restore_state(header, arrays)
+            except (KeyError, ValueError, IndexError) as e:
+                print(f"Error restoring {name} state: {e}")
+        return restored
+
+    def record_cycle(self, pairs: int, started: float):
+        """Cycle duration, throughput and limiter state for the metrics exporter"""
+        elapsed = time.perf_counter() - started
+        self.metrics.inc("scanner_cycles_total")
+        self.metrics.inc("scanner_pairs_processed_total", pairs)
+        self.metrics.observe("scanner_stage_seconds", elapsed, stage="cycle")
+        if elapsed > 0:
+            self.metrics.set("scanner_pairs_per_second", pairs / elapsed)
+        self.metrics.set("scanner_rate_limit_rps", self.rate_limiter.rate)
+        self.metrics.set("scanner_rate_limit_throttled", self.rate_limiter.throttled)
+
     def get_tracker_stats(self) -> Dict:
         """Get current tracker statistics"""
         return self.wallet_tracker.get_wallet_stats()
 
+    def get_cache_stats(self) -> Dict:
+        """Get response cache statistics"""
+        return self.cache.get_stats()
+
+def _connect_broker(address: tuple, authkey: bytes) -> tuple:
+    """Task and result queue proxies served by a coordinator's broker"""
+    broker = type("ShardBroker", (managers.BaseManager,), {})
+    broker.register("tasks")
+    broker.register("results")
+    manager = broker(address=address, authkey=authkey)
+    manager.connect()
+    return manager.tasks(), manager.results()
+
+def _shard_worker(config: Dict, tasks=None, results=None, broker: Optional[tuple] = None):
+    """Worker process: fetch and parse tasks from the queue, streaming Pair records back"""
+    if broker is not None:
+        tasks, results = _connect_broker(*broker)
+    replay = config.get('replay')
+    scanner = MemecoinScanner(
+        max_concurrency=config.get('threads', 8),
+        timeout=config.get('timeout', 10.0),
+        cache=ResponseCache(disk_path=config.get('cache_path')),
+        rate_limiter=RateLimiter(rate=config.get('rate', 5.0), burst=max(1, int(config.get('rate', 5.0) * 2))),
+        transport=FixtureAdapter(replay) if replay else None
+    )
+    scanner.base_url = config.get('base_url', scanner.base_url)
+    scanner.batch_urls.update(config.get('batch_urls', {}))
+
+    def loop():
+        while True:
+            try:
+                item = tasks.get()
+            except (EOFError, OSError):
+                return
+            if item is None:
+                # Pass the stop signal on to the other threads and workers
+                tasks.put(None)
+                return
+            cycle, idx, task, priority = item
+            pairs, error = scanner._run_task(task, priority)
+            results.put((cycle, idx, None if pairs is None else [pair.to_record() for pair in pairs], error))
+
+    threads = [threading.Thread(target=loop, name=f"shard-{i}", daemon=True)
+               for i in range(scanner.max_concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+class ShardedScanner:
+    """Fans fetch tasks out to worker processes (and remote workers via a broker)
+
+    Workers pull search terms and watchlist batches from one shared queue and
+    return compact Pair records; the coordinating scanner keeps dedupe, meta
+    tracking and strategy evaluation.
+    """
+
+    def __init__(self, config: Dict, workers: int = 4, broker: Optional[tuple] = None,
+                 authkey: Optional[bytes] = None, result_timeout: float = 120.0):
+        self.config = config
+        self.workers = workers
+        self.broker = broker
+        # The broker unpickles what authenticated clients send, so never fall back to a known key
+        self.authkey = authkey or secrets.token_hex(16).encode()
+        self.result_timeout = result_timeout
+        self.processes: List[multiprocessing.Process] = []
+        self._run_id = f"{os.getpid()}-{time.time_ns()}"
+        self._cycles = itertools.count()
+        self._server = None
+        if broker is None:
+            self.tasks = multiprocessing.Queue()
+            self.results = multiprocessing.Queue()
+        else:
+            # Plain queues in this process, served to every worker over the broker
+            self.tasks = queue.Queue()
+            self.results = queue.Queue()
+
+    @staticmethod
+    def config_for(scanner: MemecoinScanner, workers: int, replay: Optional[str] = None,
+                   cache_path: Optional[str] = None) -> Dict:
+        """Worker settings mirroring a scanner, with the request rate split between local workers"""
+        return {
+            'base_url': scanner.base_url,
+            'batch_urls': dict(scanner.batch_urls),
+            'timeout': scanner.timeout,
+            'threads': scanner.max_concurrency,
+            'rate': scanner.rate_limiter.max_rate / max(1, workers),
+            'replay': replay,
+            'cache_path': cache_path
+        }
+
+    def start(self):
+        if self.broker is not None:
+            broker = type("ShardBroker", (managers.BaseManager,), {})
+            broker.register("tasks", callable=lambda: self.tasks)
+            broker.register("results", callable=lambda: self.results)
+            self._server = broker(address=self.broker, authkey=self.authkey).get_server()
+            threading.Thread(target=self._server.serve_forever, name="shard-broker", daemon=True).start()
+            self.broker = self._server.address
+            print(f"Shard broker listening on {self.broker[0]}:{self.broker[1]}")
+
+        for idx in range(self.workers):
+            if self.broker is None:
+                args = (self.config, self.tasks, self.results)
+            else:
+                args = (self.config, None, None, (self.broker, self.authkey))
+            process = multiprocessing.Process(target=_shard_worker, args=args, name=f"shard-worker-{idx}",
+                                              daemon=True)
+            process.start()
+            self.processes.append(process)
+
+    def run(self, tasks: List[tuple], priorities: Optional[List[int]] = None):
+        """Yield (task, pairs, error) as workers finish them; pairs is None for a failed task"""
+        priorities = priorities or [0] * len(tasks)
+        cycle = (self._run_id, next(self._cycles))
+        for idx, (task, priority) in enumerate(zip(tasks, priorities)):
+            self.tasks.put((cycle, idx, task, priority))
+
+        pending = set(range(len(tasks)))
+        while pending:
+            try:
+                result_cycle, idx, records, error = self.results.get(timeout=self.result_timeout)
+            except queue.Empty:
+                print(f"Timed out waiting for {len(pending)} shard results")
+                return
+            # Late results from an abandoned cycle are dropped
+            if result_cycle != cycle or idx not in pending:
+                continue
+            pending.discard(idx)
+            yield tasks[idx], None if records is None else [Pair.from_record(r) for r in records], error
+
+    def close(self):
+        self.tasks.put(None)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
 def format_number(num: float) -> str:
     """Format numbers for display"""
     try:
@@ -411,11 +3443,391 @@ def format_number(num: float) -> str:
     except Exception:
         return "N/A"
 
-def main():
+def print_pair(idx: int, info: Dict, file=None):
+    """Print one formatted pair in the detailed listing layout"""
+    print(f"\n#{idx} {info['token_name']} (${info['token_symbol']})", file=file)
+    print(f"Price: {format_number(info['price_usd'])}", file=file)
+    print(f"FDV: {format_number(info['fdv'])}", file=file)
+    print(f"Liquidity: {format_number(info['liquidity'])}", file=file)
+    print(f"Volume 24h: {format_number(info['volume']['24h'])}", file=file)
+
+    print(f"Price Changes:", file=file)
+    print(f"  5m: {info['price_change']['5m']:.1f}%", file=file)
+    print(f"  1h: {info['price_change']['1h']:.1f}%", file=file)
+    print(f"  6h: {info['price_change']['6h']:.1f}%", file=file)
+    print(f"  24h: {info['price_change']['24h']:.1f}%", file=file)
+
+    # Whale/KOL Analysis
+    if 'wallet_analysis' in info:
+        analysis = info['wallet_analysis']
+        print("\nWhale/KOL Analysis:", file=file)
+        print(f"  Score: {analysis['score']:.1f}", file=file)
+        print(f"  Risk Level: {analysis['risk_level'].upper()}", file=file)
+        
+        if analysis['whale_metrics']['active_whales']:
+            print(f"  Active Whales: {', '.join(analysis['whale_metrics']['active_whales'])}", file=file)
+        
+        if analysis['kol_metrics']['active_kols']:
+            print(f"  Active KOLs: {', '.join(analysis['kol_metrics']['active_kols'])}", file=file)
+
+    print("\nQuick Links:", file=file)
+    print(f"Trade (Jupiter): {info['links']['jupiter']}", file=file)
+    print(f"DexScreener: {info['links']['dexscreener']}", file=file)
+    print(f"Solscan: {info['links']['solscan']}", file=file)
+    print("-" * 80, file=file)
+
+def print_delta(cycle: int, delta: Dict[str, Dict[str, List]], file=None):
+    """Print what entered, changed or left each strategy in a watch cycle"""
+    print(f"\n[{datetime.now():%H:%M:%S}] Cycle {cycle}", file=file)
+    for strategy, changes in delta.items():
+        if not any(changes.values()):
+            continue
+        print(f"\n=== {strategy}: +{len(changes['entered'])} "
+              f"~{len(changes['changed'])} -{len(changes['left'])} ===", file=file)
+        for idx, info in enumerate(changes['entered'], 1):
+            print_pair(idx, info, file)
+        for info in changes['changed']:
+            print(f"~ {info['token_name']} (${info['token_symbol']}) "
+                  f"{format_number(info['price_usd'])} | liq {format_number(info['liquidity'])} "
+                  f"| vol {format_number(info['volume']['24h'])} | 24h {info['price_change']['24h']:.1f}%",
+                  file=file)
+        for info in changes['left']:
+            label = info.get('token_name', info['pair_address'])
+            print(f"- {label} ({info['pair_address']})", file=file)
+
+def _analysis_field(key: str, default=None) -> Callable[[Pair, JupiterTrader], object]:
+    def get(pair: Pair, trader: JupiterTrader):
+        analysis = pair.wallet_analysis
+        return analysis.get(key, default) if analysis else default
+    return get
+
+def _active_wallets(metrics: str, key: str) -> Callable[[Pair, JupiterTrader], object]:
+    def get(pair: Pair, trader: JupiterTrader):
+        analysis = pair.wallet_analysis
+        return ",".join(analysis[metrics][key]) if analysis else ""
+    return get
+
+# Selectable output columns: (pair, trader) -> value, evaluated only for emitted rows
+OUTPUT_FIELDS: Dict[str, Callable[[Pair, JupiterTrader], object]] = {
+    'name': lambda pair, trader: pair.name or 'Unknown',
+    'symbol': lambda pair, trader: pair.symbol or 'Unknown',
+    **{field: (lambda pair, trader, _get=attrgetter(field): _get(pair)) for field in Pair.NUMERIC_FIELDS},
+    'dex': lambda pair, trader: pair.dex_id,
+    'pair_address': lambda pair, trader: pair.pair_address,
+    'contract': lambda pair, trader: pair.token_address,
+    'score': _analysis_field('score', 0.0),
+    'risk_level': _analysis_field('risk_level'),
+    'active_whales': _active_wallets('whale_metrics', 'active_whales'),
+    'active_kols': _active_wallets('kol_metrics', 'active_kols'),
+    'jupiter': lambda pair, trader: trader.get_trade_link(pair.token_address or '', pair.symbol or ''),
+    'dexscreener': lambda pair, trader: pair.url or '',
+    'solscan': lambda pair, trader: f"https://solscan.io/token/{pair.token_address or ''}"
+}
+
+class ResultWriter:
+    """Renders a cycle's results as text, JSON Lines, CSV or a compact table, written in one call"""
+
+    FORMATS = ('text', 'jsonl', 'csv', 'table')
+    CONTEXT_FIELDS = ('cycle', 'event', 'strategy', 'rank')
+    DEFAULT_FIELDS = ['strategy', 'rank', 'name', 'symbol', 'price_usd', 'fdv', 'liquidity', 'volume_24h',
+                      'price_change_1h', 'price_change_24h', 'score', 'risk_level', 'pair_address']
+    MONEY_FIELDS = {'price_usd', 'liquidity', 'fdv', 'market_cap',
+                    'volume_24h', 'volume_6h', 'volume_1h', 'volume_5m'}
+
+    def __init__(self, fmt: str = 'text', fields: Optional[List[str]] = None, stream=None,
+                 trader: Optional[JupiterTrader] = None,
+                 format_info: Optional[Callable[[Pair], Dict]] = None):
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown output format {fmt!r}, expected one of {self.FORMATS}")
+        unknown = [f for f in fields or [] if f not in OUTPUT_FIELDS and f not in self.CONTEXT_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown output fields: {', '.join(unknown)}")
+        self.format = fmt
+        self.fields = list(fields) if fields else None
+        self.stream = stream if stream is not None else sys.stdout
+        self.trader = trader or JupiterTrader()
+        self.format_info = format_info
+        self._header_written = False
+
+    def _getters(self, fields: List[str]) -> List[Optional[Callable]]:
+        return [None if field in self.CONTEXT_FIELDS else OUTPUT_FIELDS[field] for field in fields]
+
+    def _values(self, fields: List[str], getters: List[Optional[Callable]],
+                pair: Optional[Pair], context: Dict) -> list:
+        if pair is None:
+            return [context.get(field) for field in fields]
+        trader = self.trader
+        values = [context.get(field) if get is None else get(pair, trader) for field, get in zip(fields, getters)]
+        # NaN is not valid JSON and reads badly elsewhere
+        return [None if value != value else value for value in values]
+
+    def _cell(self, field: str, value) -> str:
+        if value is None:
+            return "-"
+        if field in self.MONEY_FIELDS:
+            return format_number(value)
+        if field.startswith('price_change'):
+            return f"{value:.1f}%"
+        if isinstance(value, float):
+            return f"{value:.1f}"
+        return str(value)
+
+    def _render_rows(self, fields: List[str], rows: List[list]) -> str:
+        buffer = io.StringIO()
+        if self.format == 'jsonl':
+            for values in rows:
+                buffer.write(_json_dumps(dict(zip(fields, values))))
+                buffer.write("\n")
+        elif self.format == 'csv':
+            writer = csv.writer(buffer, lineterminator="\n")
+            if not self._header_written:
+                writer.writerow(fields)
+                self._header_written = True
+            writer.writerows(rows)
+        else:
+            cells = [fields] + [[self._cell(f, v) for f, v in zip(fields, values)] for values in rows]
+            widths = [max(len(row[col]) for row in cells) for col in range(len(fields))]
+            for row in cells:
+                buffer.write("  ".join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+                buffer.write("\n")
+        return buffer.getvalue()
+
+    def render(self, results: Dict[str, List[Pair]]) -> str:
+        """One cycle of ranked results per strategy"""
+        if self.format == 'text':
+            buffer = io.StringIO()
+            for strategy, pairs in results.items():
+                buffer.write(f"\nProcessing {strategy}...\n")
+                if not pairs:
+                    buffer.write(f"\nNo results found for {strategy}\n")
+                    continue
+                buffer.write(f"\n=== {strategy} ===\n")
+                for idx, pair in enumerate(pairs, 1):
+                    info = self.format_info(pair)
+                    if info:
+                        print_pair(idx, info, buffer)
+            return buffer.getvalue()
+
+        fields = self.fields or self.DEFAULT_FIELDS
+        getters = self._getters(fields)
+        rows = [
+            self._values(fields, getters, pair, {'strategy': strategy, 'rank': rank})
+            for strategy, pairs in results.items()
+            for rank, pair in enumerate(pairs, 1)
+        ]
+        return self._render_rows(fields, rows)
+
+    def render_delta(self, cycle: int, delta: Dict[str, Dict[str, List]], pairs: Dict[str, Pair]) -> str:
+        """One watch cycle's entered/changed/left rows, looking pairs up by address"""
+        if self.format == 'text':
+            buffer = io.StringIO()
+            print_delta(cycle, delta, buffer)
+            return buffer.getvalue()
+
+        fields = self.fields or ['cycle', 'event'] + self.DEFAULT_FIELDS
+        getters = self._getters(fields)
+        rows = []
+        for strategy, changes in delta.items():
+            for event, infos in changes.items():
+                for rank, info in enumerate(infos, 1):
+                    address = info['pair_address']
+                    context = {'cycle': cycle, 'event': event, 'strategy': strategy,
+                               'rank': rank, 'pair_address': address}
+                    rows.append(self._values(fields, getters, pairs.get(address), context))
+        return self._render_rows(fields, rows) if rows else ""
+
+    def _emit(self, text: str):
+        if text:
+            self.stream.write(text)
+            self.stream.flush()
+
+    def write(self, results: Dict[str, List[Pair]]):
+        self._emit(self.render(results))
+
+    def write_delta(self, cycle: int, delta: Dict[str, Dict[str, List]], pairs: Dict[str, Pair]):
+        self._emit(self.render_delta(cycle, delta, pairs))
+
+def run_backtest(args: argparse.Namespace, rules: Optional[StrategyRules]):
+    """Backtest strategies (or a threshold grid) over JSONL dumps or a snapshot database"""
+    history_path = os.environ.get("SCANNER_HISTORY_PATH")
+    paths = args.backtest or ([history_path] if history_path else [])
+    if not paths:
+        print("Pass JSONL dumps or a snapshot database to --backtest, or set SCANNER_HISTORY_PATH")
+        return
+    databases = [path for path in paths if SnapshotStore.is_database(path)]
+    if databases and len(paths) > 1:
+        print("Backtest either JSONL dumps or a single snapshot database, not a mix")
+        return
+
+    started = time.perf_counter()
+    if databases:
+        store = SnapshotStore(databases[0])
+        try:
+            backtester = Backtester.from_snapshot_store(store)
+        finally:
+            store.close()
+    else:
+        backtester = Backtester.from_jsonl(paths)
+    print(f"Loaded {len(backtester):,} snapshots of {len(backtester.pair_addresses):,} pairs "
+          f"in {time.perf_counter() - started:.2f}s")
+
+    if args.grid:
+        with open(args.grid, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        grid = Backtester.expand_grid(spec["strategies"], spec["params"])
+        started = time.perf_counter()
+        results = backtester.sweep(grid, processes=args.processes)
+        print(json.dumps(results, indent=2))
+        print(f"Swept {len(grid)} combinations in {time.perf_counter() - started:.2f}s")
+        return
+
+    report = backtester.run(rules or StrategyRules(DEFAULT_STRATEGY_RULES))
+    for strategy, horizons in report.items():
+        print(f"\n=== {strategy} ===")
+        for label, stats in horizons.items():
+            print(f"  {label:>4}: {stats['picks']} picks ({stats['scored']} scored) | "
+                  f"hit {stats['hit_rate']:.1%} | avg {stats['avg_return']:+.1%} | "
+                  f"median {stats['median_return']:+.1%} | "
+                  f"avg dd {stats['avg_drawdown']:.1%} | max dd {stats['max_drawdown']:.1%}")
+
+def parse_address(value: str) -> tuple:
+    """HOST:PORT into a (host, port) socket address"""
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+def is_loopback(host: str) -> bool:
+    """Whether a host name or address only accepts local connections"""
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Solana memecoin scanner")
+    parser.add_argument("--watch", action="store_true",
+                        help="keep running and print only per-strategy changes")
+    parser.add_argument("--interval", type=float, default=60.0,
+                        help="seconds between watch cycles")
+    parser.add_argument("--cycles", type=int, default=0,
+                        help="stop after this many watch cycles (0 = forever)")
+    parser.add_argument("--replay", metavar="DIR",
+                        help="serve DEXScreener responses from fixture files instead of the network")
+    parser.add_argument("--record", metavar="DIR",
+                        help="save live DEXScreener responses as fixture files while scanning")
+    parser.add_argument("--backtest", nargs="*", metavar="PATH",
+                        help="replay recorded JSONL dumps or a snapshot database through the strategies "
+                             "instead of scanning (no paths = SCANNER_HISTORY_PATH)")
+    parser.add_argument("--grid", metavar="JSON",
+                        help='backtest a threshold grid: {"strategies": template, "params": {name: [values]}}, '
+                             'where template values written as "$name" are replaced by each combination')
+    parser.add_argument("--processes", type=int, default=None,
+                        help="worker processes for grid backtests")
+    parser.add_argument("--top", type=int, default=20,
+                        help="pairs to show per strategy")
+    parser.add_argument("--rank-by", choices=sorted(RANKING_KEYS), default="volume",
+                        help="leaderboard ranking key")
+    parser.add_argument("--format", choices=ResultWriter.FORMATS, default="text",
+                        help="output format for results")
+    parser.add_argument("--fields", type=lambda value: [f.strip() for f in value.split(",") if f.strip()],
+                        help="comma-separated columns for jsonl/csv/table output")
+    parser.add_argument("--output", metavar="PATH",
+                        help="write results to this file instead of stdout")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="fetch and parse in this many worker processes (0 = threads in this process)")
+    parser.add_argument("--broker", metavar="HOST:PORT",
+                        help="also serve the shard queues here so remote --worker processes can join "
+                             "(non-loopback addresses need SCANNER_BROKER_KEY)")
+    parser.add_argument("--worker", metavar="HOST:PORT",
+                        help="run as a shard worker for the coordinator's broker at this address")
+    parser.add_argument("--metrics-port", type=int, default=None,
+                        help="serve Prometheus metrics on this local port")
+    parser.add_argument("--metrics-json", metavar="PATH",
+                        help="periodically dump metrics as JSON to this file")
+    parser.add_argument("--metrics-interval", type=float, default=15.0,
+                        help="seconds between JSON metric dumps")
+    parser.add_argument("--checkpoint-interval", type=float, default=60.0,
+                        help="seconds between watch-mode state checkpoints (needs SCANNER_STATE_PATH)")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    scanner = None
+    state = WatchState()
+    stdout = sys.stdout
+    output = None
     try:
-        scanner = MemecoinScanner()
+        rules_path = os.environ.get("SCANNER_RULES_PATH")
+        if args.backtest is not None:
+            run_backtest(args, StrategyRules.from_file(rules_path) if rules_path else None)
+            return
+
+        broker_key = os.environ.get("SCANNER_BROKER_KEY")
+        if args.worker:
+            if not broker_key:
+                print("Set SCANNER_BROKER_KEY to the coordinator's broker key to run a shard worker")
+                return
+            print(f"Shard worker connecting to {args.worker}")
+            _shard_worker({'replay': args.replay, 'cache_path': os.environ.get("SCANNER_CACHE_PATH")},
+                          broker=(parse_address(args.worker), broker_key.encode()))
+            return
+
+        broker = parse_address(args.broker) if args.broker else None
+        if broker is not None and not broker_key and not is_loopback(broker[0]):
+            print(f"Refusing to serve the shard broker on {args.broker} without SCANNER_BROKER_KEY set")
+            return
+
+        history_path = os.environ.get("SCANNER_HISTORY_PATH")
+        metrics = Metrics(enabled=args.metrics_port is not None or bool(args.metrics_json))
+        if args.metrics_port is not None:
+            port = metrics.serve(args.metrics_port)
+            print(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+        if args.metrics_json:
+            metrics.start_dump(args.metrics_json, args.metrics_interval)
+        scanner = MemecoinScanner(
+            cache=ResponseCache(disk_path=os.environ.get("SCANNER_CACHE_PATH")),
+            rules=StrategyRules.from_file(rules_path) if rules_path else None,
+            snapshots=SnapshotStore(history_path) if history_path else None,
+            transport=FixtureAdapter(args.replay or args.record, record=bool(args.record))
+            if args.replay or args.record else None,
+            metrics=metrics
+        )
+        output = open(args.output, "w", encoding="utf-8", newline="") if args.output else stdout
+        writer = ResultWriter(args.format, args.fields, output,
+                              trader=scanner.jupiter_trader, format_info=scanner.format_pair_info)
+        if args.format != 'text' and output is stdout:
+            # Keep stdout to the structured rows; progress messages go to stderr
+            sys.stdout = sys.stderr
         print("\n🔍 Solana Memecoin Scanner v5.2\n")
 
+        if args.workers or args.broker:
+            scanner.shards = ShardedScanner(
+                ShardedScanner.config_for(scanner, args.workers, args.replay, os.environ.get("SCANNER_CACHE_PATH")),
+                workers=args.workers,
+                broker=broker,
+                authkey=broker_key.encode() if broker_key else None
+            )
+            scanner.shards.start()
+            if broker is not None and not broker_key:
+                print(f"Generated a broker key; start workers with SCANNER_BROKER_KEY={scanner.shards.authkey.decode()}")
+            if args.workers:
+                print(f"Fetching through {args.workers} worker processes")
+
+        alerts_path = os.environ.get("SCANNER_ALERTS_PATH")
+        if alerts_path:
+            scanner.alerts, sinks = AlertEngine.from_file(alerts_path, scanner.rules)
+            scanner.alert_dispatcher = AlertDispatcher.from_specs(sinks)
+            print(f"Loaded {len(scanner.alerts.definitions)} alert rules")
+
+        # Warm state from the last run: meta momentum, wallets, seen pairs, cached responses and
+        # alert state, so change/enters rules and cooldowns carry across one-shot runs
+        restored = {}
+        state_path = os.environ.get("SCANNER_STATE_PATH")
+        if state_path:
+            scanner.checkpoint = StateCheckpoint(state_path, args.checkpoint_interval)
+            restored = scanner.load_state(state)
+            if restored:
+                print("Restored state: " + ", ".join(f"{count} {name}" for name, count in restored.items()))
+
         # Example of adding new wallets
         scanner.add_whale(
             "ABC123DefExample...", 
@@ -430,6 +3842,30 @@ def main():
             tags=["Meme expert", "Early caller"]
         )
 
+        wallets_path = os.environ.get("SCANNER_WALLETS_PATH")
+        if wallets_path and not ('wallets' in restored
+                                 and os.path.getmtime(wallets_path) <= scanner.checkpoint.saved_at):
+            scanner.import_wallets(wallets_path)
+
+        activity_path = os.environ.get("SCANNER_ACTIVITY_PATH")
+        if activity_path:
+            scanner.load_wallet_activity(activity_path)
+
+        watchlist_path = os.environ.get("SCANNER_WATCHLIST_PATH")
+        if watchlist_path:
+            scanner.load_watchlist(watchlist_path)
+
+        if args.watch:
+            scanner.watch(
+                interval=args.interval,
+                cycles=args.cycles,
+                on_delta=lambda delta: writer.write_delta(state.cycles, delta, state.pairs),
+                state=state,
+                limit=args.top,
+                key=args.rank_by
+            )
+            return
+
         # Get current meta trends
         hot_metas = scanner.meta_tracker.get_hot_metas()
         print("Current Hot Metas:")
@@ -446,83 +3882,50 @@ def main():
         print(f"Total KOL Followers: {stats['kols']['total_followers']:,}")
         print()
 
-        # Search terms combining current metas and basic searches
-        search_terms = [
-            "solana meme",
-            "sol dog",
-            "sol cat",
-            "solana ai",
-            "solana new",
-            "raydium new"
-        ]
-
-        # Add terms based on hot metas
-        for meta, _ in hot_metas[:3]:
-            search_terms.append(f"solana {meta.value.lower()}")
-
-        all_pairs = []
-        for term in search_terms:
-            print(f"\nSearching: {term}")
-            pairs = scanner.search_pairs(term)
-            all_pairs.extend(pairs)
+        started = time.perf_counter()
+        search_terms, priorities = scanner.build_search_terms()
+        print(f"\nSearching {len(search_terms)} terms (up to {scanner.max_concurrency} at once)...")
+        # Leaderboards fill in as each search completes, so no full sort is needed
+        boards = scanner.new_leaderboards(k=args.top, key=args.rank_by)
+        all_pairs = scanner.search_many(
+            search_terms,
+            on_pairs=lambda query, pairs: scanner.rank_pairs(boards, pairs),
+            priorities=priorities
+        )
+        if scanner.watchlist:
+            all_pairs += scanner.refresh_watchlist(on_pairs=lambda kind, pairs: scanner.rank_pairs(boards, pairs))
 
         # Remove duplicates
-        unique_pairs = {
-            pair.get('pairAddress'): pair 
-            for pair in all_pairs 
-            if pair.get('pairAddress')
-        }
+        with scanner.metrics.timer("scanner_stage_seconds", stage="dedupe"):
+            unique_pairs = scanner.dedupe_pairs(all_pairs)
+        scanner.record_snapshots(list(unique_pairs.values()))
 
         print(f"\nFound {len(unique_pairs)} unique pairs")
+        scanner.check_alerts(list(unique_pairs.values()))
+        cache_stats = scanner.get_cache_stats()
+        print(f"Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses")
 
-        # Process each strategy
-        for strategy in ScanStrategy:
-            print(f"\nProcessing {strategy.value}...")
-            filtered_pairs = scanner.filter_pairs(list(unique_pairs.values()), strategy)
-
-            if filtered_pairs:
-                print(f"\n=== {strategy.value} ===")
-                for idx, pair in enumerate(filtered_pairs[:20], 1):
-                    info = scanner.format_pair_info(pair)
-                    if not info:
-                        continue
-
-                    print(f"\n#{idx} {info['token_name']} (${info['token_symbol']})")
-                    print(f"Price: {format_number(info['price_usd'])}")
-                    print(f"FDV: {format_number(info['fdv'])}")
-                    print(f"Liquidity: {format_number(info['liquidity'])}")
-                    print(f"Volume 24h: {format_number(info['volume']['24h'])}")
-
-                    print(f"Price Changes:")
-                    print(f"  5m: {info['price_change']['5m']:.1f}%")
-                    print(f"  1h: {info['price_change']['1h']:.1f}%")
-                    print(f"  6h: {info['price_change']['6h']:.1f}%")
-                    print(f"  24h: {info['price_change']['24h']:.1f}%")
-
-                    # Whale/KOL Analysis
-                    if 'wallet_analysis' in info:
-                        analysis = info['wallet_analysis']
-                        print("\nWhale/KOL Analysis:")
-                        print(f"  Score: {analysis['score']:.1f}")
-                        print(f"  Risk Level: {analysis['risk_level'].upper()}")
-                        
-                        if analysis['whale_metrics']['active_whales']:
-                            print(f"  Active Whales: {', '.join(analysis['whale_metrics']['active_whales'])}")
-                        
-                        if analysis['kol_metrics']['active_kols']:
-                            print(f"  Active KOLs: {', '.join(analysis['kol_metrics']['active_kols'])}")
-
-                    print("\nQuick Links:")
-                    print(f"Trade (Jupiter): {info['links']['jupiter']}")
-                    print(f"DexScreener: {info['links']['dexscreener']}")
-                    print(f"Solscan: {info['links']['solscan']}")
-                    print("-" * 80)
-            else:
-                print(f"\nNo results found for {strategy.value}")
+        # Only the displayed rows are formatted, in a single write
+        with scanner.metrics.timer("scanner_stage_seconds", stage="render"):
+            writer.write(boards.results())
+        scanner.record_cycle(len(unique_pairs), started)
 
     except Exception as e:
         print(f"An error occurred: {e}")
         return
+    finally:
+        sys.stdout = stdout
+        if output is not None and output is not stdout:
+            output.close()
+        if scanner is not None:
+            scanner.save_state(state)
+            if scanner.shards is not None:
+                scanner.shards.close()
+            if scanner.alert_dispatcher is not None:
+                scanner.alert_dispatcher.close()
+            if scanner.snapshots is not None:
+                scanner.snapshots.close()
+            scanner.metrics.close()
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,786 @@
+# benchmarks.py
+
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import random
+import resource
+import string
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from app import (
+    AlertDispatcher, AlertEngine, FixtureAdapter, MemecoinScanner, Meta, MetaTracker, Metrics, Pair, PairTable, RateLimiter, ResponseCache,
+    ResultWriter, ScanStrategy, ShardedScanner, StateCheckpoint, StrategyRules, WalletActivityStore,
+    WebhookAlertSink, parse_pairs, print_pair
+)
+
+PIPELINE_SCALES = [100, 1_000, 10_000, 100_000, 1_000_000]
+PIPELINE_STAGES = ["fetch", "parse", "update_meta", "dedupe", "filter_pairs", "filter_all", "rank",
+                   "analyze_wallet_interest", "analyze_batch", "format_pair_info", "render",
+                   "render_jsonl"]
+
+def synthetic_names(count: int, seed: int = 7) -> List[tuple]:
+    """Generate (name, symbol) pairs that look like memecoin listings"""
+    rng = random.Random(seed)
+    words = ["dog", "cat", "ai", "moon", "pepe", "frog", "bonk", "gpt", "wif", "hat",
+             "sol", "game", "inu", "elon", "trump", "based", "chad", "doge", "baby"]
+    names = []
+    for _ in range(count):
+        name = " ".join(rng.choice(words) for _ in range(rng.randint(1, 3)))
+        name += "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(0, 6)))
+        symbol = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 6)))
+        names.append((name, symbol))
+    return names
+
+def synthetic_keywords(count: int, seed: int = 11) -> List[str]:
+    """Generate extra lowercase keywords of realistic length"""
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+        for _ in range(count)
+    ]
+
+def synthetic_pairs(count: int, seed: int = 3) -> List[Dict]:
+    """Generate DEXScreener-shaped pair dicts with string-encoded numbers"""
+    rng = random.Random(seed)
+    names = synthetic_names(count, seed)
+    pairs = []
+    for idx, (name, symbol) in enumerate(names):
+        price = 10 ** rng.uniform(-8, 0)
+        pairs.append({
+            'chainId': 'solana',
+            'dexId': rng.choice(['raydium', 'orca', 'meteora']),
+            'url': f"https://dexscreener.com/solana/pair{idx}",
+            'pairAddress': f"pair{idx}",
+            'baseToken': {'address': f"mint{idx}", 'name': name, 'symbol': symbol.upper()},
+            'quoteToken': {'address': 'So11111111111111111111111111111111111111112', 'symbol': 'SOL'},
+            'priceNative': f"{price / 150:.12f}",
+            'priceUsd': f"{price:.12f}",
+            'txns': {'h24': {'buys': rng.randint(0, 5000), 'sells': rng.randint(0, 5000)}},
+            'volume': {'h24': round(10 ** rng.uniform(2, 7.5), 2), 'h6': 0, 'h1': 0, 'm5': 0},
+            'priceChange': {k: round(rng.uniform(-60, 120), 2) for k in ('m5', 'h1', 'h6', 'h24')},
+            'liquidity': {'usd': round(10 ** rng.uniform(3, 6.5), 2), 'base': 0, 'quote': 0},
+            'fdv': round(10 ** rng.uniform(4, 8), 2),
+            'pairCreatedAt': 1700000000000 + idx * 1000
+        })
+    return pairs
+
+def legacy_filter_pairs(scanner: MemecoinScanner, pairs: List[Dict], strategy: ScanStrategy) -> List[Dict]:
+    """The original row-by-row filter over raw dicts, kept as the benchmark reference"""
+    filtered = []
+    for pair in pairs:
+        try:
+            liquidity = float(pair.get('liquidity', {}).get('usd', 0) or 0)
+            volume_24h = float(pair.get('volume', {}).get('h24', 0) or 0)
+            fdv = float(pair.get('fdv', 0) or 0)
+            if liquidity == 0 or volume_24h == 0 or fdv == 0:
+                continue
+            meets_criteria = False
+            if strategy == ScanStrategy.MICRO_CAP:
+                meets_criteria = liquidity >= 10000 and volume_24h >= 30000 and 50000 <= fdv <= 20000000
+            elif strategy == ScanStrategy.SMALL_CAP:
+                meets_criteria = liquidity >= 10000 and volume_24h >= 30000 and 100000 <= fdv <= 20000000
+            elif strategy == ScanStrategy.MID_CAP:
+                meets_criteria = liquidity >= 10000 and volume_24h >= 3000000 and 1000000 <= fdv <= 3000000
+            elif strategy == ScanStrategy.DIP_HUNTING:
+                price_change_24h = float(pair.get('priceChange', {}).get('h24', 0) or 0)
+                meets_criteria = (liquidity >= 10000 and volume_24h >= 300000 and
+                                  100000 <= fdv <= 10000000 and price_change_24h < -10)
+            if meets_criteria:
+                pair['wallet_analysis'] = scanner.wallet_tracker.analyze_wallet_interest(Pair.from_raw(pair))
+                filtered.append(pair)
+        except Exception:
+            continue
+    return sorted(filtered, key=lambda x: float(x.get('volume', {}).get('h24', 0) or 0), reverse=True)
+
+def timed(fn: Callable, repeat: int = 3) -> float:
+    """Best wall-clock time of several runs"""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_meta_matching(pairs: int, extra_keywords: int) -> Dict:
+    """Compare the per-keyword substring loop with the compiled matcher"""
+    tracker = MetaTracker()
+    extra = synthetic_keywords(extra_keywords)
+    targets = [Meta.CELEBRITY, Meta.SPORTS, Meta.POLITICS, Meta.AI]
+    for idx, meta in enumerate(targets):
+        tracker.add_keywords(meta, extra[idx::len(targets)])
+
+    names = synthetic_names(pairs)
+    metas = tracker.current_metas
+
+    def legacy():
+        hits = 0
+        for name, symbol in names:
+            for data in metas.values():
+                if any(kw in name or kw in symbol for kw in data["keywords"]):
+                    hits += 1
+        return hits
+
+    def compiled():
+        matcher = tracker._get_matcher()
+        hits = 0
+        for name, symbol in names:
+            hits += len(matcher.match(name, symbol))
+        return hits
+
+    assert legacy() == compiled(), "matcher disagrees with substring loop"
+    keyword_count = sum(len(d["keywords"]) for d in metas.values())
+    return {
+        'pairs': pairs,
+        'keywords': keyword_count,
+        'legacy_s': timed(legacy),
+        'compiled_s': timed(compiled)
+    }
+
+def bench_filtering(pairs: int) -> Dict:
+    """Compare one filter pass per strategy with parsing once and a single vectorized pass"""
+    scanner = MemecoinScanner()
+    data = synthetic_pairs(pairs)
+
+    def legacy():
+        return {s: legacy_filter_pairs(scanner, data, s) for s in ScanStrategy}
+
+    def vectorized():
+        return scanner.filter_all([Pair.from_raw(p) for p in data])
+
+    expected, actual = legacy(), vectorized()
+    for strategy in ScanStrategy:
+        assert [p['pairAddress'] for p in expected[strategy]] == \
+               [p.pair_address for p in actual[strategy.value]], f"{strategy.value} results differ"
+
+    return {
+        'pairs': pairs,
+        'matches': sum(len(v) for v in actual.values()),
+        'legacy_s': timed(legacy),
+        'vectorized_s': timed(vectorized)
+    }
+
+def bench_rule_scaling(pairs: int, strategies: int) -> Dict:
+    """Time rule evaluation for many strategies drawn from a small set of shared checks"""
+    rng = random.Random(5)
+    checks = [
+        {"field": "liquidity", "op": ">=", "value": 10000},
+        {"field": "liquidity", "op": ">=", "value": 50000},
+        {"field": "volume_24h", "op": ">=", "value": 30000},
+        {"field": "volume_24h", "op": ">=", "value": 300000},
+        {"field": "fdv", "op": "between", "value": [50000, 20000000]},
+        {"field": "fdv", "op": "between", "value": [100000, 3000000]},
+        {"field": "price_change_24h", "op": "<", "value": -10},
+        {"field": "price_change_1h", "op": ">", "value": 5}
+    ]
+    rules = StrategyRules({
+        f"strategy_{idx}": {"all": rng.sample(checks, rng.randint(2, 4))}
+        for idx in range(strategies)
+    })
+    table = PairTable([Pair.from_raw(p) for p in synthetic_pairs(pairs)])
+    for column in PairTable.COLUMNS:
+        table[column]
+
+    return {
+        'pairs': pairs,
+        'strategies': strategies,
+        'evaluate_s': timed(lambda: rules.evaluate(table))
+    }
+
+def bench_wallet_activity(records: int, wallets: int, pairs: int = 10_000) -> Dict:
+    """Ingest synthetic swap records and analyse wallet interest for a batch of pairs"""
+    rng = random.Random(9)
+    now = time.time()
+    wallet_ids = [f"wallet{idx}" for idx in range(wallets)]
+    data = [Pair.from_raw(p) for p in synthetic_pairs(pairs)]
+    mints = [p.token_address for p in data]
+    rows = [
+        {'wallet': rng.choice(wallet_ids), 'mint': rng.choice(mints), 'timestamp': now - rng.uniform(0, 86000)}
+        for _ in range(records)
+    ]
+
+    scanner = MemecoinScanner()
+    tracker = scanner.wallet_tracker
+    tracker.registry.add_many(
+        {'address': address, 'type': 'kol' if idx % 2 else 'whale',
+         'followers': 1000 * idx, 'success_rate': 0.5}
+        for idx, address in enumerate(wallet_ids)
+    )
+
+    store = WalletActivityStore()
+    start = time.perf_counter()
+    store.ingest_records(rows)
+    ingest_s = time.perf_counter() - start
+    tracker.activity = store
+
+    return {
+        'records': records,
+        'wallets': wallets,
+        'pairs': pairs,
+        'ingest_s': ingest_s,
+        'analyze_each_s': timed(lambda: [tracker.analyze_wallet_interest(p) for p in data]),
+        'analyze_batch_s': timed(lambda: tracker.analyze_batch(data))
+    }
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def _memory_child(mode: str, pairs: int, per_response: int = 30):
+    """Run one parse mode in this process and report its peak RSS growth as JSON"""
+    # Build response bodies one at a time so only the encoded bytes stay alive
+    bodies = []
+    for start in range(0, pairs, per_response):
+        chunk = synthetic_pairs(min(per_response, pairs - start), seed=start)
+        for offset, pair in enumerate(chunk):
+            pair['pairAddress'] = f"pair{start + offset}"
+        bodies.append(json.dumps({'schemaVersion': '1.0.0', 'pairs': chunk}).encode())
+    baseline = _peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "dict":
+        kept = []
+        for body in bodies:
+            kept.extend(p for p in json.loads(body)['pairs'] if p.get('chainId') == 'solana')
+    else:
+        kept = []
+        for body in bodies:
+            kept.extend(parse_pairs(body))
+    elapsed = time.perf_counter() - start
+    print(json.dumps({'mode': mode, 'kept': len(kept), 'parse_s': elapsed,
+                      'peak_rss_growth_mb': _peak_rss_mb() - baseline}))
+
+def bench_memory(pairs: int) -> Dict:
+    """Peak RSS growth holding a cycle's pairs as raw dicts vs Pair records (separate processes)"""
+    result = {'pairs': pairs}
+    for mode in ("dict", "pair"):
+        out = subprocess.run(
+            [sys.executable, __file__, "micro", "--memory-child", mode, "--pairs", str(pairs)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        child = json.loads(out.strip().splitlines()[-1])
+        result[f"{mode}_parse_s"] = child['parse_s']
+        result[f"{mode}_peak_mb"] = child['peak_rss_growth_mb']
+    return result
+
+def synthetic_responses(pairs: int, per_response: int = 30, overlap: int = 5) -> Dict[str, bytes]:
+    """Encoded search responses keyed by query slug, each repeating a few pairs of the previous one"""
+    bodies = {}
+    previous = []
+    for start in range(0, pairs, per_response - overlap):
+        chunk = synthetic_pairs(min(per_response - overlap, pairs - start), seed=start)
+        for offset, pair in enumerate(chunk):
+            pair['pairAddress'] = f"pair{start + offset}"
+        # A couple of other-chain pairs per response, as the live search returns
+        foreign = [dict(chunk[0], chainId='ethereum', pairAddress=f"eth{start}")] if chunk else []
+        body = {'schemaVersion': '1.0.0', 'pairs': previous + chunk + foreign}
+        bodies[f"bench_{len(bodies)}"] = json.dumps(body).encode()
+        previous = chunk[-overlap:] if overlap else []
+    return bodies
+
+def bench_pipeline(pairs: int, repeat: Optional[int] = None) -> Dict:
+    """Time each scan stage separately over replayed synthetic responses"""
+    repeat = repeat or 3
+    bodies = synthetic_responses(pairs)
+    queries = list(bodies)
+    scanner = MemecoinScanner(
+        rate_limiter=RateLimiter(rate=1e9, burst=1e9),
+        transport=FixtureAdapter(bodies=bodies)
+    )
+    stages = {}
+
+    def run(name: str, fn: Callable):
+        result = None
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - start)
+        stages[name] = best
+        return result
+
+    fetched = run("fetch", lambda: [
+        scanner._get(scanner.base_url, params={"q": q}).content for q in queries
+    ])
+    parsed = run("parse", lambda: [pair for body in fetched for pair in parse_pairs(body)])
+    del fetched, bodies
+
+    def update_meta():
+        for pair in parsed:
+            scanner.meta_tracker.update_meta(pair)
+
+    run("update_meta", update_meta)
+    unique = list(run("dedupe", lambda: scanner.dedupe_pairs(parsed)).values())
+    run("filter_pairs", lambda: {s: scanner.filter_pairs(unique, s) for s in ScanStrategy})
+    results = run("filter_all", lambda: scanner.filter_all(unique))
+
+    def rank():
+        boards = scanner.new_leaderboards()
+        for start in range(0, len(parsed), 30):
+            scanner.rank_pairs(boards, parsed[start:start + 30])
+        return boards
+
+    run("rank", rank)
+    tracker = scanner.wallet_tracker
+    run("analyze_wallet_interest", lambda: [tracker.analyze_wallet_interest(p) for p in unique])
+    run("analyze_batch", lambda: tracker.analyze_batch(unique))
+
+    shown = [pair for matches in results.values() for pair in matches]
+    infos = run("format_pair_info", lambda: [scanner.format_pair_info(p) for p in shown])
+
+    def render():
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            for idx, info in enumerate(infos, 1):
+                if info:
+                    print_pair(idx, info)
+        return out
+
+    run("render", render)
+    run("render_jsonl", lambda: ResultWriter("jsonl", stream=io.StringIO(),
+                                             trader=scanner.jupiter_trader).write(results))
+    return {
+        'pairs': pairs,
+        'responses': len(queries),
+        'parsed': len(parsed),
+        'unique': len(unique),
+        'matches': len(shown),
+        'stages': stages
+    }
+
+def compare_to_baseline(results: List[Dict], baseline: Dict, threshold: float,
+                        min_seconds: float) -> List[str]:
+    """Stages slower than `threshold` times their baseline, skipping ones too fast to time reliably"""
+    previous = {str(r['pairs']): r['stages'] for r in baseline.get('pipeline', [])}
+    regressions = []
+    for result in results:
+        old_stages = previous.get(str(result['pairs']))
+        if not old_stages:
+            continue
+        for stage, seconds in result['stages'].items():
+            old = old_stages.get(stage)
+            if old is None or max(old, seconds) < min_seconds:
+                continue
+            if seconds > old * threshold:
+                regressions.append(
+                    f"{result['pairs']} pairs / {stage}: {seconds:.4f}s vs baseline {old:.4f}s "
+                    f"({seconds / old:.2f}x)"
+                )
+    return regressions
+
+def print_pipeline(result: Dict):
+    """Print one pipeline result as a row of stage timings"""
+    timings = "  ".join(f"{stage}={result['stages'][stage]:.4f}" for stage in PIPELINE_STAGES)
+    print(f"pipeline[{result['pairs']}] unique={result['unique']} matches={result['matches']}  {timings}")
+
+def run_pipeline(args) -> int:
+    """Run the staged suite, write JSON results and check them against a baseline"""
+    results = []
+    for scale in args.scales:
+        result = bench_pipeline(scale, args.repeat)
+        print_pipeline(result)
+        results.append(result)
+
+    report = {
+        'python': sys.version.split()[0],
+        'created': time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        'pipeline': results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return 0
+
+    try:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    except FileNotFoundError:
+        print(f"No baseline at {args.baseline}, skipping comparison")
+        return 0
+
+    regressions = compare_to_baseline(results, baseline, args.threshold, args.min_seconds)
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print(f"No regressions against {args.baseline} (threshold {args.threshold:.2f}x)")
+    return 1 if regressions else 0
+
+def _serve_stub(bodies: Dict[str, bytes], latency: float, ports,
+                failures: Optional[Dict[str, List[int]]] = None, retry_after: str = "0"):
+    """Stub DEXScreener search API: one pre-encoded body per query, after a fixed latency
+
+    `failures` lists error statuses to answer a query with, in order, before it succeeds.
+    """
+    failures = {query: list(statuses) for query, statuses in (failures or {}).items()}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            query = parse_qs(urlparse(self.path).query).get('q', [''])[0]
+            body = bodies.get(query, b'{"pairs": []}')
+            time.sleep(latency)
+            pending = failures.get(query)
+            if pending:
+                status = pending.pop(0)
+                self.send_response(status)
+                if status == 429:
+                    self.send_header("Retry-After", retry_after)
+                self.send_header("Content-Length", "4")
+                self.end_headers()
+                self.wfile.write(b"busy")
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    ports.put(server.server_port)
+    server.serve_forever()
+
+def start_stub(queries: int, pairs_per_query: int = 30, latency: float = 0.05,
+               failures=None, retry_after: str = "0") -> tuple:
+    """Start the stub API in its own process; returns (process, base url, queries)
+
+    `failures` maps a query's index to the error statuses it is answered with first.
+    """
+    bodies = synthetic_responses(queries * (pairs_per_query - 5), pairs_per_query)
+    names = list(bodies)
+    failures = {names[idx]: statuses for idx, statuses in (failures or {}).items()}
+    ports = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_stub, args=(bodies, latency, ports, failures, retry_after),
+                                      daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{ports.get(timeout=30)}", names
+
+def bench_shards(base_url: str, queries: List[str], workers: int, threads: int) -> Dict:
+    """One scan cycle (fetch, dedupe, filter) with `workers` shard processes, 0 meaning in-process threads"""
+    scanner = MemecoinScanner(max_concurrency=threads, rate_limiter=RateLimiter(rate=1e9, burst=1e9))
+    scanner.base_url = f"{base_url}/latest/dex/search"
+    if workers:
+        scanner.shards = ShardedScanner(ShardedScanner.config_for(scanner, workers), workers=workers)
+        scanner.shards.start()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            unique = scanner.dedupe_pairs(scanner.search_many(queries))
+            fetched_s = time.perf_counter() - start
+            results = scanner.filter_all(list(unique.values()))
+            elapsed = time.perf_counter() - start
+    finally:
+        if scanner.shards is not None:
+            scanner.shards.close()
+    return {
+        'workers': workers,
+        'unique': len(unique),
+        'fetch_s': fetched_s,
+        'cycle_s': elapsed,
+        'pairs_per_s': len(unique) / elapsed,
+        'results': {name: [p.pair_address for p in pairs] for name, pairs in results.items()}
+    }
+
+def run_shards(args) -> int:
+    """Run the same cycle against a stub API with 0..N workers and check the results agree"""
+    stub, base_url, queries = start_stub(args.queries, latency=args.latency)
+    try:
+        reference = None
+        for workers in args.workers:
+            result = bench_shards(base_url, queries, workers, args.threads)
+            results = result.pop('results')
+            if reference is None:
+                reference = (result, results)
+            elif results != reference[1]:
+                print(f"MISMATCH with {workers} workers: results differ from {reference[0]['workers']}")
+                return 1
+            result['speedup'] = reference[0]['cycle_s'] / result['cycle_s']
+            print_result("shards", result)
+    finally:
+        stub.terminate()
+    return 0
+
+def limiter_order(rate: float, priorities: List[int], pause: float = 0.2) -> List[tuple]:
+    """(priority, arrival) in the order a paused limiter served callers that queued lowest priority first"""
+    limiter = RateLimiter(rate=rate, burst=1)
+    limiter.penalize(pause)
+    served = []
+
+    def take(arrival: int, priority: int):
+        limiter.acquire(priority)
+        served.append((priority, arrival))
+
+    threads = [threading.Thread(target=take, args=(arrival, priority))
+               for arrival, priority in enumerate(priorities)]
+    for thread in threads:
+        thread.start()
+        # Stagger arrivals so every caller is queued, in order, before the pause ends
+        time.sleep(pause / (2 * len(threads)))
+    for thread in threads:
+        thread.join()
+    return served
+
+def run_retries(args) -> int:
+    """Scan against a stub answering some queries with 429/503 first; check retries, limiter, priority and results"""
+    failures = {}
+    for idx in range(args.queries):
+        if idx % 4 == 0:
+            failures[idx] = [429]
+        elif idx % 4 == 1:
+            failures[idx] = [503, 503]
+    stub, base_url, queries = start_stub(args.queries, latency=0.01, failures=failures,
+                                         retry_after=str(args.retry_after))
+    metrics = Metrics()
+    limiter = RateLimiter(rate=args.rate, burst=int(args.rate))
+    scanner = MemecoinScanner(max_concurrency=args.threads, cache=ResponseCache(ttl=0), rate_limiter=limiter,
+                              metrics=metrics, backoff_base=0.05, backoff_cap=1.0)
+    scanner.base_url = f"{base_url}/latest/dex/search"
+    counts = {}
+    try:
+        log = io.StringIO()
+        with contextlib.redirect_stdout(log):
+            start = time.perf_counter()
+            scanner.search_many(queries, on_pairs=lambda query, pairs: counts.__setitem__(query, len(pairs)))
+            elapsed = time.perf_counter() - start
+            throttled_rate = limiter.rate
+            # A clean second pass lets the limiter recover additively
+            scanner.search_many(queries)
+    finally:
+        stub.terminate()
+
+    retries = {series['labels']['status']: series['value']
+               for series in metrics.snapshot()['counters'].get('scanner_http_retries_total', [])}
+    expected_429 = sum(1 for statuses in failures.values() if 429 in statuses)
+    expected_503 = sum(statuses.count(503) for statuses in failures.values())
+    result = {
+        'queries': len(queries),
+        'elapsed_s': elapsed,
+        'retries_429': int(retries.get('429', 0)),
+        'retries_503': int(retries.get('503', 0)),
+        'throttled': limiter.throttled,
+        'throttled_rate': throttled_rate,
+        'recovered_rate': limiter.rate
+    }
+    print_result("retries", result)
+
+    problems = []
+    if result['retries_429'] != expected_429 or result['retries_503'] != expected_503:
+        problems.append(f"expected {expected_429} 429 and {expected_503} 503 retries")
+    if limiter.throttled != expected_429 or throttled_rate >= args.rate:
+        problems.append("limiter was not throttled by 429 responses")
+    if limiter.rate != args.rate:
+        problems.append("limiter did not recover to its configured rate")
+    expected = synthetic_responses(args.queries * 25, 30)
+    missing = [q for q in queries if counts.get(q) != len(parse_pairs(expected[q]))]
+    if missing:
+        problems.append(f"{len(missing)} queries lost results")
+    if "Error" in log.getvalue():
+        problems.append("fetch errors were reported")
+
+    # Priorities 0..3 arriving in ascending order must leave highest first, FIFO within a priority
+    priorities = [idx * 4 // args.queries for idx in range(args.queries)]
+    served = limiter_order(args.rate, priorities)
+    expected_order = sorted(((p, a) for a, p in enumerate(priorities)), key=lambda item: (-item[0], item[1]))
+    print(f"limiter served priorities {[p for p, _ in served]}")
+    if served != expected_order:
+        problems.append("throttled limiter did not serve callers by priority")
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return 1 if problems else 0
+
+def start_webhook(latency: float = 0.0) -> tuple:
+    """Local webhook stub collecting POSTed alerts; returns (server, url, received)"""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            time.sleep(latency)
+            received.append(json.loads(body))
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}/hook", received
+
+def alert_cycles(count: int) -> tuple:
+    """Two cycles of the same pairs: prices of every other pair jump 20% and every third starts dipping"""
+    raw = synthetic_pairs(count)
+    first = parse_pairs(json.dumps({'pairs': raw}).encode())
+    for idx, pair in enumerate(raw):
+        if idx % 2 == 0:
+            pair['priceUsd'] = f"{float(pair['priceUsd']) * 1.2:.12f}"
+        if idx % 3 == 0:
+            pair['priceChange']['h24'] = -25
+    second = parse_pairs(json.dumps({'pairs': raw}).encode())
+    return first, second
+
+def run_alerts(args) -> int:
+    """Check alert state survives a checkpoint restart and alerts reach a webhook stub"""
+    rules = MemecoinScanner().rules
+    definitions = [
+        {'name': 'busy', 'when': {'field': 'volume_24h', 'op': '>=', 'value': 1e6}},
+        {'name': 'pump', 'change': {'field': 'price_usd', 'op': '>=', 'value': 10}},
+        {'name': 'dip', 'enters': ScanStrategy.DIP_HUNTING.value}
+    ]
+    first, second = alert_cycles(args.pairs)
+    summarize = lambda alerts: sorted((a['rule'], a['pair_address']) for a in alerts)
+    problems = []
+    now = time.time()
+
+    # One long-running engine against two one-shot runs joined by a checkpoint
+    engine = AlertEngine(definitions, rules)
+    engine.evaluate(first, now=now)
+    continuous = engine.evaluate(second, now=now + 60)
+    with tempfile.TemporaryDirectory() as tmp:
+        checkpoint = StateCheckpoint(f"{tmp}/state.bin")
+        run1 = AlertEngine(definitions, rules)
+        run1.evaluate(first, now=now)
+        checkpoint.save({'alerts': run1.export_state()})
+        run2 = AlertEngine(definitions, rules)
+        run2.restore_state(*checkpoint.load()['alerts'])
+        restarted = run2.evaluate(second, now=now + 60)
+        checkpoint.save({'alerts': run2.export_state()})
+        run3 = AlertEngine(definitions, rules)
+        run3.restore_state(*checkpoint.load()['alerts'])
+        repeated = run3.evaluate(second, now=now + 120)
+
+    fired = {rule: sum(1 for a in restarted if a['rule'] == rule) for rule in ('busy', 'pump', 'dip')}
+    if summarize(restarted) != summarize(continuous):
+        problems.append("alerts after a checkpoint restart differ from a continuous run")
+    if not fired['pump'] or not fired['dip']:
+        problems.append("change/enters rules did not fire after a restart")
+    if repeated:
+        problems.append(f"{len(repeated)} alerts re-fired inside their cooldown after a restart")
+
+    # Every alert reaches the webhook
+    server, url, received = start_webhook()
+    dispatcher = AlertDispatcher([WebhookAlertSink(url)], max_pending=len(continuous) + 1)
+    dispatcher.submit(continuous)
+    dispatcher.flush()
+    dispatcher.close()
+    server.shutdown()
+    if summarize(received) != summarize(continuous) or dispatcher.failed:
+        problems.append(f"webhook received {len(received)} of {len(continuous)} alerts")
+
+    # A slow webhook fills the bounded queue; submit() drops instead of blocking
+    server, url, slow_received = start_webhook(latency=args.latency)
+    dispatcher = AlertDispatcher([WebhookAlertSink(url)], max_pending=args.queue)
+    start = time.perf_counter()
+    accepted = dispatcher.submit(continuous)
+    submit_s = time.perf_counter() - start
+    dispatcher.close(timeout=0.0)
+    server.shutdown()
+    if accepted + dispatcher.dropped != len(continuous) or (len(continuous) > args.queue + 1 and not dispatcher.dropped):
+        problems.append("a full queue did not count dropped alerts")
+    if submit_s > 0.1:
+        problems.append(f"submit() blocked for {submit_s:.3f}s on a slow webhook")
+
+    print_result("alerts", {
+        'pairs': args.pairs,
+        'fired': len(continuous),
+        **{f"fired_{rule}": count for rule, count in fired.items()},
+        'refired_in_cooldown': len(repeated),
+        'delivered': len(received),
+        'slow_accepted': accepted,
+        'slow_dropped': dispatcher.dropped,
+        'submit_s': submit_s
+    })
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return 1 if problems else 0
+
+def print_result(name: str, result: Dict):
+    """Print one benchmark result line"""
+    fields = ", ".join(
+        f"{k}={v:.4f}" if isinstance(v, float) else f"{k}={v}"
+        for k, v in result.items()
+    )
+    print(f"{name}: {fields}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Scanner benchmarks")
+    commands = parser.add_subparsers(dest="command")
+
+    micro = commands.add_parser("micro", help="Compare optimized components with their originals")
+    micro.add_argument("--pairs", type=int, default=20000)
+    micro.add_argument("--keywords", type=int, nargs="+", default=[0, 100, 500])
+    micro.add_argument("--filter-sizes", type=int, nargs="+", default=[10_000, 100_000])
+    micro.add_argument("--memory-pairs", type=int, default=200_000)
+    micro.add_argument("--memory-child", choices=["dict", "pair"], help=argparse.SUPPRESS)
+
+    pipeline = commands.add_parser("pipeline", help="Time each scan stage offline and check for regressions")
+    pipeline.add_argument("--scales", type=int, nargs="+", default=PIPELINE_SCALES)
+    pipeline.add_argument("--repeat", type=int, help="Runs per stage; the best is kept (default 3)")
+    pipeline.add_argument("--output", help="Write results as JSON to this path")
+    pipeline.add_argument("--baseline", default="bench_baseline.json")
+    pipeline.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with these results")
+    # Best-of-3 stage times still vary by up to ~1.6x between runs on a shared
+    # single-core box, so the gate only flags slowdowns beyond that spread
+    pipeline.add_argument("--threshold", type=float, default=1.75, help="Slowdown ratio counted as a regression")
+    pipeline.add_argument("--min-seconds", type=float, default=0.05,
+                          help="Ignore stages faster than this in both runs")
+
+    shards = commands.add_parser("shards", help="Scale a scan cycle across worker processes against a stub API")
+    shards.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4])
+    shards.add_argument("--queries", type=int, default=200)
+    shards.add_argument("--threads", type=int, default=8, help="Fetch threads per process")
+    shards.add_argument("--latency", type=float, default=0.05, help="Stub response delay in seconds")
+
+    retries = commands.add_parser("retries", help="Check retry/backoff and rate limiting against a failing stub API")
+    retries.add_argument("--queries", type=int, default=20)
+    retries.add_argument("--threads", type=int, default=8)
+    retries.add_argument("--rate", type=float, default=20.0, help="Limiter rate in requests per second")
+    retries.add_argument("--retry-after", type=float, default=0.2, help="Retry-After sent with 429 responses")
+
+    alerts = commands.add_parser("alerts", help="Check alert state across restarts and webhook delivery")
+    alerts.add_argument("--pairs", type=int, default=300)
+    alerts.add_argument("--queue", type=int, default=20, help="Dispatcher queue size for the slow-webhook check")
+    alerts.add_argument("--latency", type=float, default=0.2, help="Slow webhook response delay in seconds")
+
+    args = parser.parse_args()
+    if args.command == "alerts":
+        sys.exit(run_alerts(args))
+    if args.command == "retries":
+        sys.exit(run_retries(args))
+    if args.command == "pipeline":
+        sys.exit(run_pipeline(args))
+    if args.command == "shards":
+        sys.exit(run_shards(args))
+    if args.command is None:
+        args = micro.parse_args([])
+
+    if args.memory_child:
+        _memory_child(args.memory_child, args.pairs)
+        return
+
+    for extra in args.keywords:
+        print_result("meta_matching", bench_meta_matching(args.pairs, extra))
+    for size in args.filter_sizes:
+        print_result("filtering", bench_filtering(size))
+    print_result("wallet_activity", bench_wallet_activity(1_000_000, 5_000))
+    for count in (4, 16, 64):
+        print_result("rule_scaling", bench_rule_scaling(args.filter_sizes[-1], count))
+    print_result("memory", bench_memory(args.memory_pairs))
+
+if __name__ == "__main__":
+    main()